@@ -0,0 +1,128 @@
+import os
+import threading
+
+
+class Overloaded(Exception):
+    """Raised when the wait queue in front of generation is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many schedule generations in progress, retry later.")
+        self.retry_after = retry_after
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class AdmissionController:
+    """Concurrency limit, bounded wait queue and single-flight coalescing.
+
+    - At most `max_concurrent` computations run at once.
+    - Up to `max_queue` further computations wait for a slot; beyond that
+      `run` raises Overloaded so the caller can answer 429 + Retry-After.
+    - Calls with a key that is already being computed do not take a slot or a
+      queue place: they wait for the in-flight computation and share its
+      result (or its exception). Each waiting follower still holds a request
+      thread, so at most `max_followers` (default `max_queue`) wait across all
+      keys; beyond that `run` raises Overloaded as well.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queue: int = 8, retry_after: int = 5, queue_timeout: float | None = None,
+                 max_followers: int | None = None):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.max_followers = self.max_queue if max_followers is None else max(0, int(max_followers))
+        self.retry_after = max(1, int(retry_after))
+        self.queue_timeout = queue_timeout
+        self._slots = threading.Semaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+        self._following = 0
+        self._inflight = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'running': self._running,
+                'waiting': self._waiting,
+                'following': self._following,
+                'inflight_keys': len(self._inflight),
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'max_followers': self.max_followers,
+            }
+
+    def _admit(self):
+        if self._slots.acquire(blocking=False):
+            return
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                raise Overloaded(self.retry_after)
+            self._waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if not acquired:
+            raise Overloaded(self.retry_after)
+
+    def run(self, key, fn):
+        """Run fn() under admission control, coalescing concurrent calls with the same key."""
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            elif self._following >= self.max_followers:
+                raise Overloaded(self.retry_after)
+            else:
+                flight.followers += 1
+                self._following += 1
+
+        if not leader:
+            try:
+                flight.done.wait()
+            finally:
+                with self._lock:
+                    self._following -= 1
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            self._admit()
+            try:
+                with self._lock:
+                    self._running += 1
+                flight.result = fn()
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._slots.release()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+        return flight.result
+
+
+def from_env() -> AdmissionController:
+    """Build the generation controller from SAMAYGEN_GENERATE_* environment variables."""
+    return AdmissionController(
+        max_concurrent=int(os.environ.get('SAMAYGEN_GENERATE_CONCURRENCY', max(1, (os.cpu_count() or 2) // 2))),
+        max_queue=int(os.environ.get('SAMAYGEN_GENERATE_QUEUE', 8)),
+        retry_after=int(os.environ.get('SAMAYGEN_GENERATE_RETRY_AFTER', 5)),
+        queue_timeout=float(os.environ['SAMAYGEN_GENERATE_QUEUE_TIMEOUT']) if os.environ.get('SAMAYGEN_GENERATE_QUEUE_TIMEOUT') else None,
+        max_followers=int(os.environ['SAMAYGEN_GENERATE_FOLLOWERS']) if os.environ.get('SAMAYGEN_GENERATE_FOLLOWERS') else None,
+    )
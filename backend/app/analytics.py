@@ -0,0 +1,172 @@
+from datetime import date
+
+import numpy as np
+
+from .solver import ROOM_TYPES_BY_COMPONENT
+
+COMPONENT_TYPES = tuple(ROOM_TYPES_BY_COMPONENT)  # ('L', 'T', 'P')
+
+
+def _encode(values, vocabulary):
+    """Integer codes of values in a sorted vocabulary array (values must all be present)."""
+    return np.searchsorted(vocabulary, values).astype(np.int64)
+
+
+def _time_key(value) -> str:
+    return getattr(value, 'strftime', lambda fmt: str(value))('%H:%M:%S')
+
+
+def _is_date(value) -> bool:
+    """Only canonical YYYY-MM-DD strings; partial dates, timestamps or padding would
+    otherwise parse to an extra day and shift every per-day list."""
+    try:
+        return date.fromisoformat(value).isoformat() == value
+    except ValueError:
+        return False
+
+
+def schedule_analytics(rows, dataset):
+    """Utilization metrics for a generated (or edited) schedule.
+
+    rows are ScheduleItem dicts; dataset is solver.load_dataset output. The rows
+    are turned into integer-coded day / slot / room / subject / teacher / type
+    columns once, and every metric is a bincount or ufunc reduction over those
+    columns, so the cost stays linear in the rows with no per-row Python work
+    beyond building the columns.
+
+    Per-day and per-week lists are aligned with the returned `days` and `weeks`.
+    Rows whose date is not a canonical YYYY-MM-DD string are left out and counted
+    in `invalid_rows`.
+    """
+    slots = sorted((ts for ts in dataset.timeslots if not ts.is_break), key=lambda ts: ts.start_time)
+    slot_vocab = np.array([_time_key(ts.start_time) for ts in slots], dtype=str)
+    n_slots = len(slots)
+
+    # Columns; FREE rows still contribute their date so idle days are counted
+    dates = np.array([r['date'] for r in rows], dtype=str)
+    start = np.array([r['start_time'] for r in rows], dtype=str)
+    ctype = np.array([r.get('component_type') or '' for r in rows], dtype=str)
+    subject = np.array([r['subject'] for r in rows], dtype=str)
+    room = np.array([r['room'] for r in rows], dtype=str)
+    teacher = np.array([r.get('teacher') or '' for r in rows], dtype=str)
+
+    # Hand-edited schedules may carry malformed dates; parse each distinct value once
+    days, day_code = np.unique(dates, return_inverse=True)
+    valid_day = np.array([_is_date(v) for v in days], dtype=bool)
+    valid_row = valid_day[day_code]
+    invalid_rows = int(len(rows) - valid_row.sum())
+    if invalid_rows:
+        dates, start, ctype, subject, room, teacher = (
+            col[valid_row] for col in (dates, start, ctype, subject, room, teacher)
+        )
+        days, day_code = np.unique(dates, return_inverse=True)
+    n_days = len(days)
+
+    is_class = np.isin(ctype, COMPONENT_TYPES) & ~np.char.startswith(subject, 'EXTRA ')
+    slot_code = np.searchsorted(slot_vocab, start)
+    if n_slots:
+        # rows in break or unknown slots are not counted
+        is_class &= (slot_code < n_slots) & (slot_vocab[np.minimum(slot_code, n_slots - 1)] == start)
+    else:
+        is_class[:] = False
+
+    d, s = day_code[is_class], slot_code[is_class]
+    c_room, c_subject, c_teacher, c_type = room[is_class], subject[is_class], teacher[is_class], ctype[is_class]
+
+    # Weeks start on Monday; 1970-01-01 was a Thursday
+    day_numbers = days.astype('datetime64[D]').astype(np.int64)
+    week_start = day_numbers - (day_numbers + 3) % 7
+    weeks, week_of_day = np.unique(week_start, return_inverse=True)
+    n_weeks = len(weeks)
+    days_per_week = np.bincount(week_of_day, minlength=n_weeks)
+
+    def per_day_cells(owner_code, n_owners, d, s):
+        """(owner, day) matrix of distinct occupied slots; double bookings count once."""
+        cells = np.unique((owner_code * n_days + d) * n_slots + s)
+        return np.bincount(cells // max(n_slots, 1), minlength=n_owners * n_days).reshape(n_owners, n_days)
+
+    def per_week(matrix):
+        out = np.zeros((matrix.shape[0], n_weeks), dtype=np.int64)
+        np.add.at(out.T, week_of_day, matrix.T)
+        return out
+
+    # Rooms: every room in the dataset, plus any unknown names used by the schedule
+    room_vocab = np.unique(np.concatenate([np.array([r.name for r in dataset.rooms], dtype=str), c_room]))
+    room_booked = per_day_cells(_encode(c_room, room_vocab), len(room_vocab), d, s)
+    room_week = per_week(room_booked)
+    room_day_util = room_booked / max(n_slots, 1)
+    room_week_util = room_week / np.maximum(days_per_week * n_slots, 1)
+    total_cells = n_days * n_slots
+    rooms_out = [
+        {
+            'room': str(name),
+            'booked': int(room_booked[i].sum()),
+            'utilization': round(float(room_booked[i].sum()) / total_cells, 4) if total_cells else 0.0,
+            'by_day': np.round(room_day_util[i], 4).tolist(),
+            'by_week': np.round(room_week_util[i], 4).tolist(),
+        }
+        for i, name in enumerate(room_vocab)
+    ]
+
+    # Teachers: hours per day, then a histogram of how many days carry each load
+    assigned = (c_teacher != '') & (c_teacher != '—')
+    teacher_vocab = np.unique(c_teacher[assigned])
+    teacher_hours = per_day_cells(_encode(c_teacher[assigned], teacher_vocab), len(teacher_vocab), d[assigned], s[assigned])
+    teacher_week = per_week(teacher_hours)
+    teachers_out = [
+        {
+            'teacher': str(name),
+            'hours': int(teacher_hours[i].sum()),
+            'max_per_day': int(teacher_hours[i].max(initial=0)),
+            'max_per_week': int(teacher_week[i].max(initial=0)),
+            # index = hours taught in a day, value = number of days with that load
+            'daily_histogram': np.bincount(teacher_hours[i], minlength=n_slots + 1).tolist(),
+        }
+        for i, name in enumerate(teacher_vocab)
+    ]
+
+    # Subjects: delivered slot-hours per component type against declared hours
+    declared = {
+        subj.name: {'L': int(subj.lecture_hours or 0), 'T': int(subj.tutorial_hours or 0), 'P': int(subj.practical_hours or 0)}
+        for subj in dataset.subjects
+    }
+    subject_vocab = np.unique(np.concatenate([np.array(list(declared), dtype=str), c_subject]))
+    n_types = len(COMPONENT_TYPES)
+    # COMPONENT_TYPES is not in sorted order, so encode against the sorted array and map back
+    type_order = np.argsort(COMPONENT_TYPES)
+    type_code = type_order[_encode(c_type, np.array(COMPONENT_TYPES, dtype=str)[type_order])]
+    delivered = np.bincount(
+        _encode(c_subject, subject_vocab) * n_types + type_code, minlength=len(subject_vocab) * n_types
+    ).reshape(len(subject_vocab), n_types)
+    subjects_out = []
+    for i, name in enumerate(subject_vocab):
+        dec = declared.get(str(name), dict.fromkeys(COMPONENT_TYPES, 0))
+        got = dict(zip(COMPONENT_TYPES, delivered[i].tolist()))
+        subjects_out.append({
+            'subject': str(name),
+            'declared': dec,
+            'delivered': got,
+            'shortfall': sum(max(0, dec[t] - got[t]) for t in COMPONENT_TYPES),
+        })
+
+    # Gaps: empty slots between the first and last class of each day
+    cells = np.unique(d * n_slots + s)
+    cell_day, cell_slot = np.divmod(cells, max(n_slots, 1))
+    occupied = np.bincount(cell_day, minlength=n_days)
+    first = np.full(n_days, n_slots, dtype=np.int64)
+    last = np.full(n_days, -1, dtype=np.int64)
+    np.minimum.at(first, cell_day, cell_slot)
+    np.maximum.at(last, cell_day, cell_slot)
+    gaps = np.where(occupied > 0, last - first + 1 - occupied, 0)
+
+    return {
+        'days': days.tolist(),
+        'weeks': weeks.astype('datetime64[D]').astype(str).tolist(),
+        'slots_per_day': n_slots,
+        'rooms': rooms_out,
+        'teachers': teachers_out,
+        'subjects': subjects_out,
+        'gaps_by_day': gaps.tolist(),
+        'total_gaps': int(gaps.sum()),
+        'invalid_rows': invalid_rows,
+    }
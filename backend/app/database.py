@@ -11,8 +11,39 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def create_tables():
-    from .models import Base
+    """Create tables unless the database already carries the current schema version.
+
+    The version is kept in SQLite's PRAGMA user_version, so a warm start costs a
+    single pragma read instead of reflecting every table. Returns True when the
+    schema was (re)applied.
+    """
+    from .models import Base, SCHEMA_VERSION
+    with engine.connect() as conn:
+        current = conn.exec_driver_sql("PRAGMA user_version").scalar()
+    if current == SCHEMA_VERSION:
+        return False
+
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(Base)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
+    return True
+
+def add_missing_columns(Base):
+    """Add columns introduced after a table was first created (create_all never alters tables)."""
+    from sqlalchemy import inspect
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                default = getattr(column.default, 'arg', None)
+                if default is not None and not callable(default):
+                    ddl += f" DEFAULT {default!r}" if isinstance(default, str) else f" DEFAULT {int(default)}"
+                conn.exec_driver_sql(ddl)
 
 def get_db():
     db = SessionLocal()
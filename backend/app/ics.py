@@ -0,0 +1,164 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+
+
+COMPONENT_LABELS = {'L': 'Lecture', 'T': 'Tutorial', 'P': 'Practical'}
+
+# RFC 5545 recommends folding content lines longer than 75 octets
+MAX_LINE_OCTETS = 75
+
+
+def escape_text(value) -> str:
+    """Escape a TEXT property value (RFC 5545 section 3.3.11)."""
+    text = str(value if value is not None else '')
+    return (
+        text.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line at 75 octets and terminate it with CRLF."""
+    raw = line.encode('utf-8')
+    if len(raw) <= MAX_LINE_OCTETS:
+        return line + '\r\n'
+    parts = []
+    limit = MAX_LINE_OCTETS
+    while raw:
+        cut = min(limit, len(raw))
+        # never split inside a multi-byte UTF-8 sequence
+        while cut < len(raw) and (raw[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(raw[:cut].decode('utf-8'))
+        raw = raw[cut:]
+        # continuation lines start with a space, which counts towards the limit
+        limit = MAX_LINE_OCTETS - 1
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _local_stamp(d: date, hhmmss: str) -> str:
+    parts = (str(hhmmss).split(':') + ['00', '00'])[:3]
+    return f"{d.strftime('%Y%m%d')}T{int(parts[0]):02d}{int(parts[1]):02d}{int(parts[2]):02d}"
+
+
+def is_exportable(row) -> bool:
+    """FREE fillers and EXTRA advisory rows are not real class meetings."""
+    if row.get('component_type') not in COMPONENT_LABELS:
+        return False
+    return not str(row.get('subject', '')).startswith('EXTRA ')
+
+
+def merge_blocks(rows):
+    """Merge the per-slot rows of a multi-slot block into one row spanning the block.
+
+    Rows belong to the same block when they share date, room, subject, component
+    type and index and each one starts where the previous one ends.
+    """
+    def block_key(row):
+        return (row['date'], row.get('room'), row.get('subject'), row.get('component_type'), row.get('component_index'))
+
+    merged = []
+    for row in sorted(rows, key=lambda r: block_key(r) + (str(r.get('start_time')),)):
+        prev = merged[-1] if merged else None
+        if prev is not None and block_key(prev) == block_key(row) and prev.get('end_time') == row.get('start_time'):
+            prev['end_time'] = row.get('end_time')
+        else:
+            merged.append(dict(row))
+    merged.sort(key=lambda r: (r['date'], str(r.get('start_time'))))
+    return merged
+
+
+def group_weekly_runs(rows):
+    """Collapse rows that repeat every 7 days into (row, occurrence_count) runs.
+
+    Rows are grouped by everything that appears in the event except the date;
+    within a group, consecutive dates exactly one week apart form a run that is
+    emitted as a single VEVENT with a weekly RRULE.
+    """
+    groups = {}
+    for row in rows:
+        d = date.fromisoformat(row['date'])
+        key = (
+            d.weekday(),
+            row.get('start_time'),
+            row.get('end_time'),
+            row.get('subject'),
+            row.get('room'),
+            row.get('teacher'),
+            row.get('component_type'),
+        )
+        groups.setdefault(key, []).append((d, row))
+
+    runs = []
+    for occurrences in groups.values():
+        occurrences.sort(key=lambda x: x[0])
+        run_start, run_row = occurrences[0]
+        prev = run_start
+        count = 1
+        for d, row in occurrences[1:]:
+            if d - prev == timedelta(days=7):
+                count += 1
+            else:
+                runs.append((run_start, run_row, count))
+                run_start, run_row, count = d, row, 1
+            prev = d
+        runs.append((run_start, run_row, count))
+    runs.sort(key=lambda r: (r[0], r[1].get('start_time') or ''))
+    return runs
+
+
+def iter_vevents(rows, recurring: bool = True):
+    """Yield VEVENT blocks one at a time for the given schedule rows."""
+    dtstamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    rows = merge_blocks([r for r in rows if is_exportable(r)])
+    if recurring:
+        runs = group_weekly_runs(rows)
+    else:
+        runs = [(date.fromisoformat(r['date']), r, 1) for r in rows]
+
+    for start, row, count in runs:
+        ctype = row.get('component_type')
+        label = COMPONENT_LABELS.get(ctype, ctype)
+        uid_parts = [
+            start.strftime('%Y%m%d'),
+            str(row.get('start_time', '')).replace(':', ''),
+            str(row.get('room', '')),
+            str(row.get('subject', '')),
+            str(ctype),
+        ]
+        lines = [
+            'BEGIN:VEVENT',
+            f"UID:{re.sub(r'[^A-Za-z0-9]+', '-', '-'.join(uid_parts))}@samaygen",
+            f'DTSTAMP:{dtstamp}',
+            f"DTSTART:{_local_stamp(start, row.get('start_time'))}",
+            f"DTEND:{_local_stamp(start, row.get('end_time'))}",
+            f"SUMMARY:{escape_text(row.get('subject'))} ({label})",
+            f"LOCATION:{escape_text(row.get('room'))}",
+        ]
+        description = f"{label}"
+        if count == 1 and row.get('component_index'):
+            description += f" #{row.get('component_index')}"
+        if row.get('teacher'):
+            description += f" - {row.get('teacher')}"
+        lines.append(f'DESCRIPTION:{escape_text(description)}')
+        if count > 1:
+            lines.append(f'RRULE:FREQ=WEEKLY;COUNT={count}')
+        lines.append('END:VEVENT')
+        yield ''.join(fold_line(line) for line in lines)
+
+
+def iter_calendar(rows, calendar_name: str, recurring: bool = True):
+    """Stream an iCalendar document event by event."""
+    yield ''.join(fold_line(line) for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//SamayGen//Timetable Export//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(calendar_name)}',
+    ))
+    yield from iter_vevents(rows, recurring=recurring)
+    yield fold_line('END:VCALENDAR')
@@ -1,17 +1,46 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import date
-from . import models, schemas, database, solver
+from typing import Optional
+import asyncio
+import json
+import sqlite3
+import zlib
+from pydantic import ValidationError
+from . import models, schemas, database, admission, result_store
 from .database import get_db, create_tables
+# solver and ics are imported inside the endpoints that use them so that
+# a cold start only pays for the CRUD surface
 
 # Create tables on startup using modern lifespan approach
 from contextlib import asynccontextmanager
 
+def warm_up():
+    """Exercise the request/response models once so the first real request
+    does not pay for validator and serializer initialisation."""
+    request = schemas.ScheduleRequest.model_validate(
+        {"start_date": "2025-01-06", "end_date": "2025-01-10", "teacher_map": {"1": 1}}
+    )
+    response = schemas.ScheduleResponse(
+        success=True,
+        schedule=[schemas.ScheduleItem(
+            date=request.start_date.isoformat(), start_time="09:00:00", end_time="10:00:00",
+            subject="warm-up", room="warm-up", teacher="warm-up", component_type="L", component_index=1
+        )],
+        legend={"warm-up": "warm-up"},
+    )
+    response.model_dump_json()
+    for model in (schemas.Teacher, schemas.Room, schemas.Subject, schemas.TimeSlot, schemas.Holiday):
+        model.model_json_schema()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup: skips DDL when the schema version already matches
     create_tables()
+    warm_up()
     yield
     # Shutdown (if needed)
 
@@ -51,7 +80,7 @@ def update_teacher(teacher_id: int, teacher: schemas.TeacherCreate, db: Session
     if db_teacher is None:
         raise HTTPException(status_code=404, detail="Teacher not found")
 
-    for field, value in teacher.dict().items():
+    for field, value in teacher.dict(exclude_unset=True).items():
         setattr(db_teacher, field, value)
 
     db.commit()
@@ -95,7 +124,7 @@ def update_room(room_id: int, room: schemas.RoomCreate, db: Session = Depends(ge
     if db_room is None:
         raise HTTPException(status_code=404, detail="Room not found")
 
-    for field, value in room.dict().items():
+    for field, value in room.dict(exclude_unset=True).items():
         setattr(db_room, field, value)
 
     db.commit()
@@ -139,7 +168,7 @@ def update_subject(subject_id: int, subject: schemas.SubjectCreate, db: Session
     if db_subject is None:
         raise HTTPException(status_code=404, detail="Subject not found")
 
-    for field, value in subject.dict().items():
+    for field, value in subject.dict(exclude_unset=True).items():
         setattr(db_subject, field, value)
 
     db.commit()
@@ -244,23 +273,268 @@ def delete_holiday(holiday_id: int, db: Session = Depends(get_db)):
     db.commit()
     return {"message": "Holiday deleted"}
 
+# Admission control in front of generation: concurrency limit, bounded queue
+# and coalescing of identical in-flight requests (see admission.py)
+generation = admission.from_env()
+# Finished results shared by all worker processes (see result_store.py); None when disabled
+results = result_store.from_env()
+
+def generation_key(kind: str, dataset, params: dict):
+    """Dataset version plus request parameters; identifies interchangeable generations."""
+    from . import solver
+    return (solver.dataset_version(dataset), kind, json.dumps(params, sort_keys=True, default=str))
+
+def run_admitted(key, compute):
+    """Run a generation under admission control."""
+    try:
+        return generation.run(key, compute)
+    except admission.Overloaded as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def cached_result(store_key: str, model):
+    """model parsed from the shared result store, or None on a miss.
+
+    The store is best-effort: SQLite failures, corrupt blobs and entries written
+    by a build with a different response schema all count as a miss, and the
+    caller's fresh result overwrites the entry.
+    """
+    if results is None:
+        return None
+    try:
+        cached = results.get(store_key)
+        return model.model_validate_json(cached) if cached is not None else None
+    except (sqlite3.Error, zlib.error, UnicodeDecodeError, ValidationError):
+        return None
+
+def generate_admitted(dataset, start_date: date, end_date: date, teacher_map: dict, seed: int = 0, starts: int = 1, progress=None):
+    from . import solver
+    params = {
+        'start_date': start_date,
+        'end_date': end_date,
+        'teacher_map': teacher_map,
+        'seed': seed,
+        'starts': starts,
+    }
+    key = generation_key('generate', dataset, params)
+    store_key = result_store.ResultStore.make_key(*key)
+
+    cached = cached_result(store_key, schemas.ScheduleResponse)
+    if cached is not None:
+        return cached
+
+    def compute():
+        result = solver.schedule_from_dataset(
+            dataset, start_date, end_date, teacher_map=teacher_map, seed=seed, starts=starts, progress=progress
+        )
+        if results is not None:
+            try:
+                results.put(store_key, result.model_dump_json())
+            except sqlite3.Error:
+                pass
+        return result
+
+    return run_admitted(key, compute)
+
+def parse_teacher_map(raw: Optional[str]) -> dict:
+    """teacher_map query parameter: a JSON object of subject_id -> teacher_id."""
+    try:
+        return {int(k): int(v) for k, v in json.loads(raw).items()} if raw else {}
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="teacher_map must be a JSON object of subject_id -> teacher_id")
+
 # Main solver endpoint
 @app.post("/generate/", response_model=schemas.ScheduleResponse)
 def generate_schedule(request: schemas.ScheduleRequest, db: Session = Depends(get_db)):
+    from . import solver
     try:
-        result = solver.create_curriculum_schedule(
-            db,
+        dataset = solver.load_dataset(db)
+        result = generate_admitted(
+            dataset,
             request.start_date,
             request.end_date,
-            teacher_map=request.teacher_map or {}
+            teacher_map=request.teacher_map or {},
+            seed=request.seed,
+            starts=request.starts
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         return schemas.ScheduleResponse(
             success=False,
             error=str(e)
         )
 
+# Background generations behind /generate/stream; the loop only keeps weak references to tasks
+_stream_tasks = set()
+
+@app.get("/generate/stream")
+async def generate_stream(
+    start_date: date,
+    end_date: date,
+    teacher_map: Optional[str] = None,
+    seed: int = 0,
+    starts: int = Query(1, ge=1, le=64),
+):
+    """Server-Sent Events variant of /generate/ (GET so that EventSource can consume it).
+
+    Emits `progress` events as the pipeline moves through loading, calendar,
+    expansion, placement and filling, then a single `result` event carrying the
+    ScheduleResponse, or an `error` event when admission control rejects the run.
+    teacher_map is a JSON object of subject_id -> teacher_id.
+    """
+    from . import solver
+    from .progress import EventStream
+    mapping = parse_teacher_map(teacher_map)
+
+    stream = EventStream()
+
+    def work():
+        # The request-scoped session is not usable once the response has started
+        db = database.SessionLocal()
+        try:
+            reporter = stream.reporter()
+            reporter.stage('loading')
+            dataset = solver.load_dataset(db)
+            result = generate_admitted(dataset, start_date, end_date, mapping, seed=seed, starts=starts, progress=reporter)
+            stream.put('result', result.model_dump_json())
+        except HTTPException as e:
+            stream.put('error', {'status': e.status_code, 'detail': e.detail, 'retry_after': (e.headers or {}).get('Retry-After')})
+        except Exception as e:
+            stream.put('result', schemas.ScheduleResponse(success=False, error=str(e)).model_dump_json())
+        finally:
+            db.close()
+            stream.close()
+
+    # work runs on the shared threadpool; the response awaits its events on the loop
+    task = asyncio.create_task(run_in_threadpool(work))
+    _stream_tasks.add(task)
+    task.add_done_callback(_stream_tasks.discard)
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/generate/batch", response_model=schemas.BatchScheduleResponse)
+def generate_batch(request: schemas.BatchScheduleRequest, db: Session = Depends(get_db)):
+    from . import solver
+    # Load base data once; every scenario shares it
+    dataset = solver.load_dataset(db)
+    scenarios = []
+    for sc in request.scenarios:
+        scenarios.append({
+            'name': sc.name,
+            'start_date': sc.start_date or request.start_date,
+            'end_date': sc.end_date or request.end_date,
+            'teacher_map': sc.teacher_map if sc.teacher_map is not None else (request.teacher_map or {}),
+            'extra_rooms': [r.dict() for r in sc.extra_rooms],
+            'seed': sc.seed,
+            'starts': sc.starts,
+        })
+    try:
+        scenario_results, best = run_admitted(
+            generation_key('batch', dataset, request.model_dump(mode='json')),
+            lambda: solver.run_scenarios(dataset, scenarios)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        # Failures outside a single scenario (e.g. the shared calendar) fail every scenario
+        scenario_results = [
+            {'name': sc['name'] or f"scenario-{idx + 1}", 'result': schemas.ScheduleResponse(success=False, error=str(e))}
+            for idx, sc in enumerate(scenarios)
+        ]
+        best = None
+    return schemas.BatchScheduleResponse(
+        scenarios=[schemas.ScenarioResult(**r) for r in scenario_results],
+        best=best
+    )
+
+# Bulk validation endpoint
+@app.post("/validate", response_model=schemas.ValidationResponse)
+def validate(request: schemas.ValidateRequest, db: Session = Depends(get_db)):
+    from . import solver
+    from .validation import validate_schedule
+    violations = validate_schedule([item.dict() for item in request.schedule], solver.load_dataset(db))
+    counts = {}
+    for v in violations:
+        counts[v['kind']] = counts.get(v['kind'], 0) + 1
+    return schemas.ValidationResponse(
+        valid=not violations,
+        checked=len(request.schedule),
+        violations=[schemas.Violation(**v) for v in violations],
+        counts=counts
+    )
+
+# Utilization analytics endpoint
+@app.post("/analytics", response_model=schemas.AnalyticsResponse)
+def schedule_analytics(request: schemas.AnalyticsRequest, db: Session = Depends(get_db)):
+    from . import solver
+    dataset = solver.load_dataset(db)
+    rows = [item.dict() for item in request.schedule]
+    # Cached per (dataset version, schedule) in the shared result store
+    store_key = result_store.ResultStore.make_key(
+        solver.dataset_version(dataset), 'analytics', json.dumps(rows, sort_keys=True)
+    )
+    cached = cached_result(store_key, schemas.AnalyticsResponse)
+    if cached is not None:
+        return cached
+
+    # NumPy is only loaded once analytics are requested
+    from .analytics import schedule_analytics as compute_analytics
+    result = schemas.AnalyticsResponse(**compute_analytics(rows, dataset))
+    if results is not None:
+        try:
+            results.put(store_key, result.model_dump_json())
+        except sqlite3.Error:
+            pass
+    return result
+
+# Calendar export endpoint
+@app.get("/export/ics")
+def export_ics(
+    start_date: date,
+    end_date: date,
+    teacher: Optional[int] = None,
+    room: Optional[int] = None,
+    recurring: bool = True,
+    teacher_map: Optional[str] = None,
+    seed: int = 0,
+    starts: int = Query(1, ge=1, le=64),
+    db: Session = Depends(get_db),
+):
+    """Export the timetable generated with the same teacher_map / seed / starts
+    as the /generate/ request it should match; teacher_map is a JSON object."""
+    from . import solver, ics
+    mapping = parse_teacher_map(teacher_map)
+    if (teacher is None) == (room is None):
+        raise HTTPException(status_code=400, detail="Specify exactly one of 'teacher' or 'room'")
+
+    if teacher is not None:
+        target = db.query(models.Teacher).filter(models.Teacher.id == teacher).first()
+        if target is None:
+            raise HTTPException(status_code=404, detail="Teacher not found")
+        field = 'teacher'
+    else:
+        target = db.query(models.Room).filter(models.Room.id == room).first()
+        if target is None:
+            raise HTTPException(status_code=404, detail="Room not found")
+        field = 'room'
+
+    # Same key as the equivalent /generate/ request, so both share one computation
+    result = generate_admitted(solver.load_dataset(db), start_date, end_date, mapping, seed, starts)
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.error)
+
+    rows = [item.dict() for item in result.schedule or [] if getattr(item, field) == target.name]
+    filename = f"{field}-{target.id}.ics"
+    return StreamingResponse(
+        ics.iter_calendar(rows, f"SamayGen - {target.name}", recurring=recurring),
+        media_type="text/calendar",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
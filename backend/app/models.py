@@ -1,14 +1,52 @@
+from datetime import date
 from sqlalchemy import Column, Integer, String, Boolean, Date, Time, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
+# Bump whenever a table or column is added; see database.create_tables
+SCHEMA_VERSION = 4
+
+
+class DateList(TypeDecorator):
+    """List of dates stored as comma-separated ISO strings."""
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if not value:
+            return None
+        return ",".join(sorted({(d if isinstance(d, date) else date.fromisoformat(str(d))).isoformat() for d in value}))
+
+    def process_result_value(self, value, dialect):
+        return [date.fromisoformat(v) for v in value.split(",") if v] if value else []
+
+
+class IntList(TypeDecorator):
+    """List of integers stored as comma-separated text."""
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if not value:
+            return None
+        return ",".join(str(int(v)) for v in sorted(set(value)))
+
+    def process_result_value(self, value, dialect):
+        return [int(v) for v in value.split(",") if v] if value else []
+
 class Teacher(Base):
     __tablename__ = "teachers"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
+    # Availability and load limits, compiled into bitmasks by the solver
+    unavailable_dates = Column(DateList, nullable=True, default=None)
+    unavailable_timeslots = Column(IntList, nullable=True, default=None)  # TimeSlot ids never taught
+    max_hours_per_day = Column(Integer, nullable=True, default=None)
+    max_hours_per_week = Column(Integer, nullable=True, default=None)
 
 class Room(Base):
     __tablename__ = "rooms"
@@ -16,6 +54,7 @@ class Room(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     room_type = Column(String, nullable=False)  # 'Lecture Hall', 'Classroom', 'Lab'
+    capacity = Column(Integer, nullable=True, default=None)  # seats; None = unknown, treated as unlimited
 
 class Subject(Base):
     __tablename__ = "subjects"
@@ -28,6 +67,11 @@ class Subject(Base):
     # New categorization fields
     semester = Column(Integer, nullable=True, default=None)
     branch = Column(String, nullable=True, default=None)
+    # Students per class; rooms smaller than this are never assigned
+    enrollment = Column(Integer, nullable=True, default=None)
+    # Contiguous block sizes (in time slots) for scheduling lectures / practicals
+    lecture_block_size = Column(Integer, nullable=True, default=1)
+    practical_block_size = Column(Integer, nullable=True, default=1)
 
 class TimeSlot(Base):
     __tablename__ = "timeslots"
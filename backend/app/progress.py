@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+
+
+class ProgressReporter:
+    """Forwards generation pipeline events to a sink callable.
+
+    Stage changes are always forwarded. Placement ticks arrive once per
+    component, so they are throttled: the clock is only read every
+    `check_every` ticks and an event is emitted at most every `min_interval`
+    seconds, which keeps the per-component overhead to a counter increment.
+    """
+
+    def __init__(self, sink, min_interval: float = 0.25, check_every: int = 64):
+        self.sink = sink
+        self.min_interval = min_interval
+        self.check_every = max(1, int(check_every))
+        self._ticks = 0
+        self._last = 0.0
+
+    def stage(self, name: str, **data):
+        self.sink({'stage': name, **data})
+
+    def placement(self, placed: int, total: int, unplaced: int, force: bool = False):
+        self._ticks += 1
+        if not force:
+            if self._ticks % self.check_every:
+                return
+            now = time.monotonic()
+            if now - self._last < self.min_interval:
+                return
+            self._last = now
+        self.sink({'stage': 'placement', 'placed': placed, 'total': total, 'unplaced': unplaced})
+
+
+class EventStream:
+    """Bridge from a worker thread's ProgressReporter to an SSE response.
+
+    Must be created on the event loop that serves the response: put() and
+    close() may be called from any thread and hand each event to the loop with
+    call_soon_threadsafe, so the response itself waits without holding a thread.
+    """
+
+    _CLOSE = object()
+
+    def __init__(self, keepalive: float = 15.0):
+        self.keepalive = keepalive
+        self._loop = asyncio.get_running_loop()
+        self._events = asyncio.Queue()
+
+    def put(self, event: str, data):
+        self._send((event, data))
+
+    def close(self):
+        self._send(self._CLOSE)
+
+    def _send(self, item):
+        try:
+            self._loop.call_soon_threadsafe(self._events.put_nowait, item)
+        except RuntimeError:
+            # loop already closed (server shutting down); nobody is listening
+            pass
+
+    def reporter(self, **kwargs) -> ProgressReporter:
+        return ProgressReporter(lambda data: self.put('progress', data), **kwargs)
+
+    async def __aiter__(self):
+        """Yield Server-Sent Events frames until close() is called."""
+        while True:
+            try:
+                item = await asyncio.wait_for(self._events.get(), self.keepalive)
+            except asyncio.TimeoutError:
+                # comment line keeps proxies from closing an idle connection
+                yield ': keep-alive\n\n'
+                continue
+            if item is self._CLOSE:
+                return
+            event, data = item
+            payload = data if isinstance(data, str) else json.dumps(data, default=str)
+            yield f"event: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class ResultStore:
+    """Generation results shared by every worker process through a local SQLite file.
+
+    Values are compressed JSON strings keyed by an opaque string (dataset version
+    plus request parameters). Entries expire after `ttl` seconds, and once the
+    stored payloads exceed `max_bytes` the least recently used ones are evicted.
+    WAL journaling lets readers in other workers proceed while one writes.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialised = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._init_lock:
+                if not self._initialised:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS results ("
+                        " key TEXT PRIMARY KEY,"
+                        " value BLOB NOT NULL,"
+                        " size INTEGER NOT NULL,"
+                        " expires_at REAL NOT NULL,"
+                        " last_access REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+                    self._initialised = True
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def get(self, key: str):
+        """Return the stored JSON string for key, or None when missing or expired."""
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT value, expires_at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def put(self, key: str, value: str):
+        blob = zlib.compress(value.encode('utf-8'))
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+            (key, blob, len(blob), now + self.ttl, now),
+        )
+        self.evict(now)
+
+    def evict(self, now: float | None = None):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        now = time.time() if now is None else now
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_access").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    total -= size
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> dict:
+        entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes, 'ttl': self.ttl}
+
+
+def from_env():
+    """Build the store from SAMAYGEN_RESULT_STORE* environment variables; None when disabled."""
+    path = os.environ.get('SAMAYGEN_RESULT_STORE', './samaygen_results.db')
+    if path.lower() in ('', 'off', 'none', '0'):
+        return None
+    return ResultStore(
+        path,
+        ttl=float(os.environ.get('SAMAYGEN_RESULT_TTL', 3600)),
+        max_bytes=int(float(os.environ.get('SAMAYGEN_RESULT_STORE_MB', 64)) * 1024 * 1024),
+    )
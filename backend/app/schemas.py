@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import date, time
 
@@ -6,6 +6,10 @@ from datetime import date, time
 # Base and Create Schemas
 class TeacherBase(BaseModel):
     name: str
+    unavailable_dates: List[date] = []
+    unavailable_timeslots: List[int] = []  # TimeSlot ids
+    max_hours_per_day: Optional[int] = Field(None, ge=1)
+    max_hours_per_week: Optional[int] = Field(None, ge=1)
 
 
 class TeacherCreate(TeacherBase):
@@ -15,6 +19,7 @@ class TeacherCreate(TeacherBase):
 class RoomBase(BaseModel):
     name: str
     room_type: str
+    capacity: Optional[int] = Field(None, ge=0)  # seats; None = unknown
 
 
 class RoomCreate(RoomBase):
@@ -28,6 +33,9 @@ class SubjectBase(BaseModel):
     practical_hours: int = 0
     semester: Optional[int] = None
     branch: Optional[str] = None
+    enrollment: Optional[int] = Field(None, ge=0)  # students per class; picks the smallest room that seats them
+    lecture_block_size: int = Field(1, ge=1)  # adjacent slots per lecture session
+    practical_block_size: int = Field(1, ge=1)  # adjacent slots per lab session, e.g. 3 for a 3-hour lab
 
 
 class SubjectCreate(SubjectBase):
@@ -94,6 +102,8 @@ class ScheduleRequest(BaseModel):
     start_date: date
     end_date: date
     teacher_map: Optional[dict[int, int]] = None  # subject_id -> teacher_id
+    seed: int = 0  # rotation seed; 0 reproduces the default ordering
+    starts: int = Field(1, ge=1, le=64)  # >1 runs a multi-start search over seed..seed+starts-1
 
 
 class ScheduleItem(BaseModel):
@@ -111,4 +121,97 @@ class ScheduleResponse(BaseModel):
     success: bool
     schedule: Optional[List[ScheduleItem]] = None
     legend: Optional[dict] = None
-    error: Optional[str] = None
\ No newline at end of file
+    seed: Optional[int] = None
+    error: Optional[str] = None
+
+
+# Schemas for batch what-if generation
+class ScenarioOverride(BaseModel):
+    name: Optional[str] = None
+    start_date: Optional[date] = None  # defaults to the batch start_date
+    end_date: Optional[date] = None  # defaults to the batch end_date
+    teacher_map: Optional[dict[int, int]] = None  # replaces the batch teacher_map when given
+    extra_rooms: List[RoomCreate] = []  # hypothetical rooms added for this scenario only
+    seed: int = 0
+    starts: int = Field(1, ge=1, le=64)
+
+
+class BatchScheduleRequest(BaseModel):
+    start_date: date
+    end_date: date
+    teacher_map: Optional[dict[int, int]] = None
+    scenarios: List[ScenarioOverride] = Field(..., min_length=1, max_length=32)
+
+
+class ScenarioResult(BaseModel):
+    name: str
+    result: ScheduleResponse
+    placed: int = 0
+    unplaced: int = 0
+    free: int = 0
+    gaps: int = 0
+    imbalance: int = 0
+
+
+class BatchScheduleResponse(BaseModel):
+    scenarios: List[ScenarioResult]
+    best: Optional[str] = None  # name of the scenario with fewest unplaced, then fewest gaps
+
+
+# Schemas for bulk validation of edited schedules
+class ValidateRequest(BaseModel):
+    schedule: List[ScheduleItem]
+
+
+class Violation(BaseModel):
+    row: int  # index into the submitted schedule
+    kind: str  # room_clash, teacher_clash, room_type, room_capacity, unknown_room, break, holiday, subject_daily_cap, teacher_unavailable, invalid
+    message: str
+    related_row: Optional[int] = None  # earlier row it clashes with
+
+
+class ValidationResponse(BaseModel):
+    valid: bool
+    checked: int
+    violations: List[Violation] = []
+    counts: dict[str, int] = {}
+
+
+# Schemas for schedule utilization analytics
+class AnalyticsRequest(BaseModel):
+    schedule: List[ScheduleItem]
+
+
+class RoomUtilization(BaseModel):
+    room: str
+    booked: int  # occupied slot-hours
+    utilization: float  # booked / (days * slots per day)
+    by_day: List[float]  # aligned with AnalyticsResponse.days
+    by_week: List[float]  # aligned with AnalyticsResponse.weeks
+
+
+class TeacherLoad(BaseModel):
+    teacher: str
+    hours: int
+    max_per_day: int
+    max_per_week: int
+    daily_histogram: List[int]  # index = hours in a day, value = number of days
+
+
+class SubjectHours(BaseModel):
+    subject: str
+    declared: dict[str, int]  # per component type (L/T/P)
+    delivered: dict[str, int]
+    shortfall: int
+
+
+class AnalyticsResponse(BaseModel):
+    days: List[str]
+    weeks: List[str]  # Monday of each week
+    slots_per_day: int
+    rooms: List[RoomUtilization]
+    teachers: List[TeacherLoad]
+    subjects: List[SubjectHours]
+    gaps_by_day: List[int]
+    total_gaps: int
+    invalid_rows: int = 0  # rows skipped because their date could not be parsed
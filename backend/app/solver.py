@@ -1,10 +1,34 @@
 from sqlalchemy.orm import Session
 from datetime import datetime, date, timedelta
 from . import models, schemas
+import hashlib
 import json
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from itertools import chain
 from types import SimpleNamespace
 
 
+# Attributes copied when ORM rows are detached for the solver and its worker processes
+TEACHER_FIELDS = ('id', 'name', 'unavailable_dates', 'unavailable_timeslots', 'max_hours_per_day', 'max_hours_per_week')
+ROOM_FIELDS = ('id', 'name', 'room_type', 'capacity')
+SUBJECT_FIELDS = ('id', 'name', 'lecture_hours', 'tutorial_hours', 'practical_hours', 'semester', 'branch', 'enrollment',
+                  'lecture_block_size', 'practical_block_size')
+TIMESLOT_FIELDS = ('id', 'start_time', 'end_time', 'is_break')
+
+# Room types each component type may use: Lecture Hall & Classroom for L, plus Lab for T, Lab only for P
+ROOM_TYPES_BY_COMPONENT = {
+    'L': ('Lecture Hall', 'Classroom'),
+    'T': ('Lecture Hall', 'Classroom', 'Lab'),
+    'P': ('Lab',),
+}
+# Cap classes per subject per day (change here to 1 if required); a multi-slot block counts once
+MAX_PER_SUBJECT_PER_DAY = 2
+
+
 def hash_id(x: str) -> int:
     """Deterministic non-cryptographic hash for stable ordering."""
     h = 0
@@ -13,30 +37,168 @@ def hash_id(x: str) -> int:
         h &= 0xFFFFFFFF
     return h
 
+def seeded_key(subject_id, seed: int = 0) -> str:
+    """Key used for per-subject ordering/rotation; seed 0 keeps the original ordering."""
+    return f"{seed}:{subject_id}" if seed else str(subject_id)
+
+class TeachingCalendar(Sequence):
+    """Teaching dates held as integer day ordinals (8 bytes per day).
+
+    Behaves like a read-only list of dates; date objects are only created when
+    an element is accessed, and slicing returns another calendar without copying
+    any dates.
+    """
+    __slots__ = ('_ordinals',)
+
+    def __init__(self, ordinals=()):
+        self._ordinals = ordinals if isinstance(ordinals, array) else array('q', ordinals)
+
+    def __len__(self):
+        return len(self._ordinals)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return TeachingCalendar(self._ordinals[i])
+        return date.fromordinal(self._ordinals[i])
+
+    def __iter__(self):
+        return map(date.fromordinal, self._ordinals)
+
+    def ordinal(self, i) -> int:
+        return self._ordinals[i]
+
+    def __repr__(self):
+        return f"TeachingCalendar({len(self)} days)"
+
+def iter_teaching_dates(start_date: date, end_date: date, holidays=()):
+    """Yield the dates between start and end date, excluding Sundays and the given holiday dates"""
+    holidays = set(holidays)
+    current_date = start_date
+    one_day = timedelta(days=1)
+    while current_date <= end_date:
+        # Skip Sundays and holidays
+        if current_date.weekday() != 6 and current_date not in holidays:  # 0=Monday, 6=Sunday
+            yield current_date
+        current_date += one_day
+
+def teaching_dates(start_date: date, end_date: date, holidays=()):
+    """All teaching dates between start and end date as a compact TeachingCalendar"""
+    return TeachingCalendar(d.toordinal() for d in iter_teaching_dates(start_date, end_date, holidays))
+
 def get_valid_teaching_dates(db: Session, start_date: date, end_date: date):
     """Get all valid teaching dates between start and end date, excluding Sundays and holidays"""
-    valid_dates = []
-    current_date = start_date
+    holidays = {
+        h.date for h in db.query(models.Holiday.date).filter(
+            models.Holiday.date >= start_date, models.Holiday.date <= end_date
+        )
+    }
+    return teaching_dates(start_date, end_date, holidays)
+
+def load_dataset(db: Session):
+    """Load every table the solver needs once, detached into plain picklable objects."""
+    return SimpleNamespace(
+        teachers=_plain(db.query(models.Teacher).all(), TEACHER_FIELDS),
+        rooms=_plain(db.query(models.Room).all(), ROOM_FIELDS),
+        subjects=_plain(db.query(models.Subject).all(), SUBJECT_FIELDS),
+        timeslots=_plain(db.query(models.TimeSlot).all(), TIMESLOT_FIELDS),
+        holidays={h.date for h in db.query(models.Holiday.date)},
+    )
 
-    while current_date <= end_date:
-        # Skip Sundays
-        if current_date.weekday() != 6:  # 0=Monday, 6=Sunday
-            # Check if it's a holiday
-            holiday = db.query(models.Holiday).filter(models.Holiday.date == current_date).first()
-            if not holiday:
-                valid_dates.append(current_date)
-        current_date += timedelta(days=1)
+def dataset_version(dataset) -> str:
+    """Stable fingerprint of a loaded dataset; changes whenever any row that affects generation does."""
+    h = hashlib.sha1()
+    for name in ('teachers', 'rooms', 'subjects', 'timeslots'):
+        for obj in sorted(getattr(dataset, name), key=lambda o: o.id):
+            h.update(repr(sorted(vars(obj).items())).encode())
+        h.update(b'|')
+    h.update(repr(sorted(dataset.holidays)).encode())
+    return h.hexdigest()[:16]
+
+def _blocks(hours: int, block_size: int):
+    """Split declared hours into block durations of block_size (the last block takes the remainder)."""
+    size = max(1, block_size)
+    full, rest = divmod(max(0, hours), size)
+    return [size] * full + ([rest] if rest else [])
+
+def expand_components(subjects):
+    """Deconstruct subjects into atomic L/T/P class components.
+    Lectures and practicals are grouped into contiguous blocks of the subject's
+    lecture_block_size / practical_block_size slots (1 by default).
+    """
+    class_components = []
+    for subject in subjects:
+        # Create lecture components
+        lecture_blocks = _blocks(int(getattr(subject, 'lecture_hours', 0) or 0), int(getattr(subject, 'lecture_block_size', 1) or 1))
+        for i, duration in enumerate(lecture_blocks):
+            class_components.append({
+                'subject_id': subject.id,
+                'subject_name': subject.name,
+                'enrollment': getattr(subject, 'enrollment', None),
+                'component_type': 'L',
+                'component_index': i + 1,
+                'duration': duration  # Number of adjacent time slots
+            })
 
-    return valid_dates
+        # Create tutorial components
+        for i in range(int(getattr(subject, 'tutorial_hours', 0) or 0)):
+            class_components.append({
+                'subject_id': subject.id,
+                'subject_name': subject.name,
+                'enrollment': getattr(subject, 'enrollment', None),
+                'component_type': 'T',
+                'component_index': i + 1,
+                'duration': 1
+            })
 
-def create_curriculum_schedule(db: Session, start_date: date, end_date: date, teacher_map: dict | None = None):
-    """Create a curriculum schedule using a deterministic greedy semester-aware algorithm."""
+        # Create practical components
+        practical_blocks = _blocks(int(getattr(subject, 'practical_hours', 0) or 0), int(getattr(subject, 'practical_block_size', 1) or 1))
+        for i, duration in enumerate(practical_blocks):
+            class_components.append({
+                'subject_id': subject.id,
+                'subject_name': subject.name,
+                'enrollment': getattr(subject, 'enrollment', None),
+                'component_type': 'P',
+                'component_index': i + 1,
+                'duration': duration  # A lab block occupies this many adjacent slots in one lab
+            })
+    return class_components
 
+def assign_teachers(subjects, teachers, teacher_map: dict | None = None):
+    """Teacher assignment: prefer teacher_map[subject.id], else round-robin"""
+    subject_teacher_assignments = {}
+    teacher_map = teacher_map or {}
+    if not teachers:
+        return subject_teacher_assignments
+    for subject in subjects:
+        mapped = teacher_map.get(subject.id)
+        if mapped and any(t.id == mapped for t in teachers):
+            subject_teacher_assignments[subject.id] = mapped
+        else:
+            used = set(subject_teacher_assignments.values())
+            fallback = next((t.id for t in teachers if t.id not in used), teachers[0].id)
+            subject_teacher_assignments[subject.id] = fallback
+    return subject_teacher_assignments
+
+def create_curriculum_schedule(db: Session, start_date: date, end_date: date, teacher_map: dict | None = None, seed: int = 0, starts: int = 1):
+    """Create a curriculum schedule using a deterministic greedy semester-aware algorithm.
+
+    With starts > 1, seeds seed..seed+starts-1 are tried in parallel and the
+    best-scoring schedule is returned together with the seed that produced it.
+    """
     # Get all data from database
-    teachers = db.query(models.Teacher).all()
-    rooms = db.query(models.Room).all()
-    subjects = db.query(models.Subject).all()
-    timeslots = db.query(models.TimeSlot).all()
+    dataset = load_dataset(db)
+    return schedule_from_dataset(dataset, start_date, end_date, teacher_map=teacher_map, seed=seed, starts=starts)
+
+def schedule_from_dataset(dataset, start_date: date, end_date: date, teacher_map: dict | None = None, seed: int = 0, starts: int = 1,
+                          valid_dates=None, class_components=None, max_workers: int | None = None, progress=None):
+    """Run the scheduling pipeline on an already loaded dataset.
+    valid_dates and class_components may be passed in when precomputed (e.g. shared across batch scenarios).
+    progress, when given, is a progress.ProgressReporter notified as each stage starts.
+    """
+    teachers = list(dataset.teachers or [])
+    rooms = list(dataset.rooms or [])
+    subjects = list(dataset.subjects or [])
+    timeslots = list(dataset.timeslots or [])
 
     if not subjects:
         return schemas.ScheduleResponse(
@@ -45,16 +207,10 @@ def create_curriculum_schedule(db: Session, start_date: date, end_date: date, te
         )
 
     # Get valid teaching dates (exclude Sundays and holidays)
-    valid_dates = get_valid_teaching_dates(db, start_date, end_date)
-    # Defensive normalization
-    if not isinstance(valid_dates, list):
-        valid_dates = [valid_dates]
-    if not isinstance(rooms, list):
-        rooms = list(rooms) if rooms is not None else []
-    if not isinstance(timeslots, list):
-        timeslots = list(timeslots) if timeslots is not None else []
-    if not isinstance(subjects, list):
-        subjects = list(subjects) if subjects is not None else []
+    if progress is not None:
+        progress.stage('calendar')
+    if valid_dates is None:
+        valid_dates = teaching_dates(start_date, end_date, dataset.holidays)
 
     if not valid_dates:
         return schemas.ScheduleResponse(
@@ -87,50 +243,11 @@ def create_curriculum_schedule(db: Session, start_date: date, end_date: date, te
         )
 
     # Deconstruct subjects into atomic components
-    class_components = []
-    subject_teacher_assignments = {}
-    teacher_map = teacher_map or {}
-
-    for subject in subjects:
-        # Create lecture components
-        for i in range(int(getattr(subject, 'lecture_hours', 0) or 0)):
-            class_components.append({
-                'subject_id': subject.id,
-                'subject_name': subject.name,
-                'component_type': 'L',
-                'component_index': i + 1,
-                'duration': 1  # Each lecture is 1 time slot
-            })
-
-        # Create tutorial components
-        for i in range(int(getattr(subject, 'tutorial_hours', 0) or 0)):
-            class_components.append({
-                'subject_id': subject.id,
-                'subject_name': subject.name,
-                'component_type': 'T',
-                'component_index': i + 1,
-                'duration': 1
-            })
-
-        # Create practical components
-        for i in range(int(getattr(subject, 'practical_hours', 0) or 0)):
-            class_components.append({
-                'subject_id': subject.id,
-                'subject_name': subject.name,
-                'component_type': 'P',
-                'component_index': i + 1,
-                'duration': 1  # Each practical hour is 1 time slot
-            })
-
-        # Teacher assignment: prefer teacher_map[subject.id], else round-robin
-        if teachers:
-            mapped = teacher_map.get(subject.id)
-            if mapped and any(t.id == mapped for t in teachers):
-                subject_teacher_assignments[subject.id] = mapped
-            else:
-                used = set(subject_teacher_assignments.values())
-                fallback = next((t.id for t in teachers if t.id not in used), teachers[0].id)
-                subject_teacher_assignments[subject.id] = fallback
+    if progress is not None:
+        progress.stage('expansion', teaching_days=len(valid_dates))
+    if class_components is None:
+        class_components = expand_components(subjects)
+    subject_teacher_assignments = assign_teachers(subjects, teachers, teacher_map)
 
     total_components = len(class_components)
 
@@ -147,14 +264,189 @@ def create_curriculum_schedule(db: Session, start_date: date, end_date: date, te
     rooms_for_build = rooms if rooms else [SimpleNamespace(id=0, name='UNASSIGNED', room_type='Classroom')]
 
     # Build schedule using the new semester-aware greedy logic
-    schedule_data, legend = build_semester_schedule(class_components, valid_dates, available_slots, rooms_for_build, teachers, subject_teacher_assignments)
+    if progress is not None:
+        progress.stage('placement', total=total_components, starts=starts)
+    if starts and starts > 1:
+        # variants run in worker processes, so only the final count is reported
+        schedule_data, legend, seed = multi_start_schedule(class_components, valid_dates, available_slots, rooms_for_build, teachers, subject_teacher_assignments, seed=seed, starts=starts, max_workers=max_workers)
+        if progress is not None:
+            placed = len({(r['subject'], r['component_type'], r['component_index']) for r in schedule_data})
+            progress.placement(placed, total_components, total_components - placed, force=True)
+    else:
+        schedule_data, legend = build_semester_schedule(class_components, valid_dates, available_slots, rooms_for_build, teachers, subject_teacher_assignments, seed=seed, progress=progress)
+    if progress is not None:
+        progress.stage('filling')
     schedule_data = append_free_classes(schedule_data, valid_dates, available_slots, rooms_for_build, subjects)
 
     return schemas.ScheduleResponse(
         success=True,
         schedule=schedule_data,
-        legend=legend
+        legend=legend,
+        seed=seed
+    )
+
+def score_schedule(schedule_data, total_components, valid_dates, available_slots):
+    """Score a placement result; lower is better.
+    Returns (unplaced, gaps, imbalance):
+    - unplaced: required slots (component durations) left unfilled
+    - gaps: empty slots between the first and last class of each day
+    - imbalance: spread (max - min) of classes per teaching day
+    """
+    slot_pos = {
+        (getattr(ts.start_time, 'strftime', lambda fmt: str(ts.start_time))('%H:%M:%S')): i
+        for i, ts in enumerate(available_slots)
+    }
+    per_day = {getattr(d, 'isoformat', lambda: str(d))(): [] for d in valid_dates}
+    for row in schedule_data:
+        pos = slot_pos.get(row['start_time'])
+        if pos is not None and row['date'] in per_day:
+            per_day[row['date']].append(pos)
+
+    gaps = 0
+    for positions in per_day.values():
+        if positions:
+            gaps += (max(positions) - min(positions) + 1) - len(set(positions))
+    counts = [len(p) for p in per_day.values()] or [0]
+    imbalance = max(counts) - min(counts)
+    unplaced = max(0, total_components - len(schedule_data))
+    return (unplaced, gaps, imbalance)
+
+def _plain(objs, fields):
+    """Detach ORM rows into picklable namespaces for worker processes."""
+    return [SimpleNamespace(**{f: getattr(o, f, None) for f in fields}) for o in objs]
+
+# Worker processes shared by every multi-start and batch request (see _map_jobs)
+_pool = None
+_pool_lock = threading.Lock()
+
+def _process_pool():
+    """Process pool created on first use and reused for the life of the API process.
+
+    Workers come from a forkserver (spawn where that is unavailable) rather than
+    fork() of the multi-threaded server, so they never inherit locks or SQLite
+    connections held by other request threads, and requests do not pay pool start-up.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+def _discard_process_pool():
+    """Drop a broken pool so the next request starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _map_jobs(fn, jobs, max_workers: int | None = None):
+    """list(map(fn, jobs)) on the shared process pool, or in this process when only
+    one worker is allowed. fn and jobs must be picklable.
+    """
+    workers = max(1, min(len(jobs), max_workers or os.cpu_count() or 1))
+    if workers == 1:
+        return [fn(job) for job in jobs]
+    try:
+        return list(_process_pool().map(fn, jobs))
+    except (OSError, RuntimeError):  # includes BrokenProcessPool
+        # Process pools are unavailable in some sandboxes; fall back to sequential
+        _discard_process_pool()
+        return [fn(job) for job in jobs]
+
+def _run_seed(args):
+    class_components, valid_dates, available_slots, rooms, teachers, subject_teacher_assignments, seed = args
+    schedule_data, legend = build_semester_schedule(class_components, valid_dates, available_slots, rooms, teachers, subject_teacher_assignments, seed=seed)
+    demand = sum(int(c.get('duration', 1) or 1) for c in class_components)
+    score = score_schedule(schedule_data, demand, valid_dates, available_slots)
+    return score, seed, schedule_data, legend
+
+def multi_start_schedule(class_components, valid_dates, available_slots, rooms, teachers, subject_teacher_assignments, seed: int = 0, starts: int = 4, max_workers: int | None = None):
+    """Run `starts` seeded variants of build_semester_schedule across a process pool
+    and return (schedule_data, legend, seed) of the best one. Ties go to the lowest seed,
+    so the result is reproducible by passing the returned seed with starts=1.
+    """
+    payload = (
+        class_components,
+        list(valid_dates),
+        _plain(available_slots, TIMESLOT_FIELDS),
+        _plain(rooms, ROOM_FIELDS),
+        _plain(teachers or [], TEACHER_FIELDS),
+        dict(subject_teacher_assignments or {}),
     )
+    jobs = [payload + (seed + i,) for i in range(starts)]
+    results = _map_jobs(_run_seed, jobs, max_workers)
+
+    score, best_seed, schedule_data, legend = min(results, key=lambda r: (r[0], r[1]))
+    return schedule_data, legend, best_seed
+
+def summarize_result(result, available_slots):
+    """Comparison metrics for one generated schedule (placed/unplaced/free counts, gaps, day imbalance)."""
+    if not result.success or not result.schedule:
+        return {'placed': 0, 'unplaced': 0, 'free': 0, 'gaps': 0, 'imbalance': 0}
+    rows = [item.dict() for item in result.schedule]
+    placed = [r for r in rows if r['component_type'] in ('L', 'T', 'P') and not r['subject'].startswith('EXTRA ')]
+    unplaced = sum(1 for r in rows if r['subject'].startswith('EXTRA '))
+    free = sum(1 for r in rows if r['component_type'] == 'F')
+    days = sorted({r['date'] for r in rows})
+    _, gaps, imbalance = score_schedule(placed, len(placed), days, available_slots)
+    return {'placed': len(placed), 'unplaced': unplaced, 'free': free, 'gaps': gaps, 'imbalance': imbalance}
+
+def _run_scenario(args):
+    dataset, start_date, end_date, teacher_map, seed, starts, valid_dates, class_components = args
+    # Already running inside a worker: multi-start variants run sequentially here
+    try:
+        result = schedule_from_dataset(dataset, start_date, end_date, teacher_map=teacher_map, seed=seed, starts=starts,
+                                       valid_dates=valid_dates, class_components=class_components, max_workers=1)
+    except Exception as e:
+        # One failing scenario is reported in its own result instead of failing the batch
+        result = schemas.ScheduleResponse(success=False, error=str(e))
+    available_slots = [ts for ts in dataset.timeslots if not getattr(ts, 'is_break', False)]
+    return result, summarize_result(result, available_slots)
+
+def run_scenarios(dataset, scenarios, max_workers: int | None = None):
+    """Run several what-if scenarios against one loaded dataset.
+    Each scenario is a dict with name, start_date, end_date, teacher_map, extra_rooms, seed and starts.
+    The teaching calendar (over the union of all horizons) and the component expansion are computed
+    once and shared; scenarios run in parallel worker processes.
+    Returns (results, best_name) where results is a list of dicts with name, result and metrics.
+    """
+    if not scenarios:
+        return [], None
+
+    calendar = teaching_dates(
+        min(sc['start_date'] for sc in scenarios),
+        max(sc['end_date'] for sc in scenarios),
+        dataset.holidays,
+    )
+    class_components = expand_components(dataset.subjects)
+
+    jobs = []
+    for sc in scenarios:
+        data = dataset
+        if sc.get('extra_rooms'):
+            extra = [
+                SimpleNamespace(id=-(i + 1), name=r['name'], room_type=r['room_type'], capacity=r.get('capacity'))
+                for i, r in enumerate(sc['extra_rooms'])
+            ]
+            data = SimpleNamespace(**{**vars(dataset), 'rooms': list(dataset.rooms) + extra})
+        lo = bisect_left(calendar, sc['start_date'])
+        hi = bisect_right(calendar, sc['end_date'])
+        jobs.append((data, sc['start_date'], sc['end_date'], sc.get('teacher_map') or {},
+                     sc.get('seed', 0), sc.get('starts', 1), calendar[lo:hi], class_components))
+
+    outcomes = _map_jobs(_run_scenario, jobs, max_workers)
+
+    results = []
+    for idx, (sc, (result, metrics)) in enumerate(zip(scenarios, outcomes)):
+        results.append({'name': sc.get('name') or f"scenario-{idx + 1}", 'result': result, **metrics})
+
+    candidates = [r for r in results if r['result'].success]
+    best = min(candidates, key=lambda r: (r['unplaced'], r['gaps'], r['imbalance'])) if candidates else None
+    return results, (best['name'] if best else None)
 
 def extract_solution(solver, schedule, class_components, valid_dates, available_slots, rooms, teachers, subjects, subject_teacher_assignments):
     """Extract solution from solver results"""
@@ -313,6 +605,171 @@ def generate_minimal_schedule(class_components, valid_dates, available_slots, ro
     return schedule_data, {}
 
 
+class FreeIntervals:
+    """Run-length index of one day's free slot positions.
+
+    Positions are slots in start-time order; the free cells are kept as sorted,
+    disjoint [start, end) runs that never cross a break, so a block of N
+    adjacent slots fits exactly when some run (minus teacher-blocked positions)
+    has N consecutive positions. Occupying a cell bisects to its run and splits
+    it; the longest run length is cached, so full or fragmented days are
+    rejected without looking at any slot. find() is linear in the number of
+    runs (a handful per day): each run is tested with a few integer bit
+    operations rather than by trying every starting slot.
+    """
+    __slots__ = ('starts', 'ends', 'longest')
+
+    def __init__(self, runs):
+        self.starts = [a for a, _ in runs]
+        self.ends = [b for _, b in runs]
+        self.longest = max((b - a for a, b in runs), default=0)
+
+    def occupy(self, pos: int, length: int = 1):
+        i = bisect_right(self.starts, pos) - 1
+        if i < 0 or pos + length > self.ends[i]:
+            raise ValueError(f"positions {pos}..{pos + length - 1} are not free")
+        a, b = self.starts[i], self.ends[i]
+        pieces = [(x, y) for x, y in ((a, pos), (pos + length, b)) if y > x]
+        self.starts[i:i + 1] = [x for x, _ in pieces]
+        self.ends[i:i + 1] = [y for _, y in pieces]
+        if b - a == self.longest:
+            self.longest = max((y - x for x, y in zip(self.starts, self.ends)), default=0)
+
+    def find(self, length: int, blocked_mask: int = 0):
+        """Earliest position starting `length` free adjacent positions, skipping bits set in blocked_mask."""
+        if self.longest < length:
+            return None
+        for a, b in zip(self.starts, self.ends):
+            if b - a < length:
+                continue
+            if not blocked_mask:
+                return a
+            usable = (((1 << (b - a)) - 1) << a) & ~blocked_mask
+            # bit p of fits is set when positions p .. p+length-1 are all usable
+            fits = usable
+            for k in range(1, length):
+                fits &= usable >> k
+            if fits:
+                return (fits & -fits).bit_length() - 1
+        return None
+
+class TeacherConstraints:
+    """One teacher's availability and load limits compiled against a teaching calendar.
+
+    - blocked: one byte per day index, set when the teacher is unavailable that day
+      or has reached the daily/weekly hour limit, so day eligibility is one lookup
+    - slot_mask: bit i set when slot index i is never available
+    - day_load / week_load: running hour counters updated by book()
+    """
+    __slots__ = ('blocked', 'slot_mask', 'max_day', 'max_week', 'day_load', 'week_load', 'week_of', 'week_days')
+
+    def __init__(self, n_days, slot_mask, max_day, max_week, week_of, week_days):
+        self.blocked = bytearray(n_days)
+        self.slot_mask = slot_mask
+        self.max_day = max_day
+        self.max_week = max_week
+        self.day_load = array('l', [0]) * n_days if max_day else None
+        self.week_load = array('l', [0]) * len(week_days) if max_week else None
+        self.week_of = week_of
+        self.week_days = week_days
+
+    def fits(self, di: int, hours: int) -> bool:
+        """Whether `hours` more teaching on day index di stays within the daily and weekly limits."""
+        if self.blocked[di]:
+            return False
+        if self.day_load is not None and self.day_load[di] + hours > self.max_day:
+            return False
+        if self.week_load is not None and self.week_load[self.week_of[di]] + hours > self.max_week:
+            return False
+        return True
+
+    def book(self, di: int, hours: int = 1):
+        if self.day_load is not None:
+            self.day_load[di] += hours
+            if self.day_load[di] >= self.max_day:
+                self.blocked[di] = 1
+        if self.week_load is not None:
+            wk = self.week_of[di]
+            self.week_load[wk] += hours
+            if self.week_load[wk] >= self.max_week:
+                lo, hi = self.week_days[wk]
+                self.blocked[lo:hi] = b'\x01' * (hi - lo)
+
+def compile_teacher_constraints(teachers, valid_dates, available_slots):
+    """Compile per-teacher availability into TeacherConstraints keyed by teacher id.
+    Teachers without any availability data are left out, so they cost nothing during placement.
+    """
+    constrained = [
+        t for t in (teachers or [])
+        if getattr(t, 'unavailable_dates', None) or getattr(t, 'unavailable_timeslots', None)
+        or getattr(t, 'max_hours_per_day', None) or getattr(t, 'max_hours_per_week', None)
+    ]
+    if not constrained or not valid_dates:
+        return {}
+
+    n_days = len(valid_dates)
+    ordinals = [d.toordinal() for d in valid_dates]
+    day_index = {o: i for i, o in enumerate(ordinals)}
+    # Monday-based week number per day index (ordinal 1 is a Monday); dates are sorted,
+    # so each week covers a contiguous range of day indexes
+    week_of = array('l')
+    week_days = []
+    prev_week = None
+    for i, o in enumerate(ordinals):
+        wk = (o - 1) // 7
+        if wk != prev_week:
+            week_days.append([i, i + 1])
+            prev_week = wk
+        else:
+            week_days[-1][1] = i + 1
+        week_of.append(len(week_days) - 1)
+    week_days = [tuple(w) for w in week_days]
+    slot_pos = {getattr(ts, 'id', ts): i for i, ts in enumerate(available_slots)}
+
+    constraints = {}
+    for t in constrained:
+        slot_mask = 0
+        for sid in getattr(t, 'unavailable_timeslots', None) or ():
+            if sid in slot_pos:
+                slot_mask |= 1 << slot_pos[sid]
+        tc = TeacherConstraints(
+            n_days, slot_mask,
+            getattr(t, 'max_hours_per_day', None), getattr(t, 'max_hours_per_week', None),
+            week_of, week_days,
+        )
+        for d in getattr(t, 'unavailable_dates', None) or ():
+            di = day_index.get(d.toordinal())
+            if di is not None:
+                tc.blocked[di] = 1
+        constraints[t.id] = tc
+    return constraints
+
+def room_seats(room) -> float:
+    """Seats in a room; rooms without a recorded capacity count as unlimited."""
+    capacity = getattr(room, 'capacity', None)
+    return float('inf') if capacity is None else capacity
+
+class RoomIndex:
+    """Rooms sorted by capacity for best-fit lookups.
+
+    Ties (and rooms without a capacity, which sort last) keep the (room_type, id)
+    order, so without capacity data best_fit() returns the same room the
+    scheduler always picked. best_fit(n) bisects to the smallest room seating n.
+    """
+    __slots__ = ('rooms', 'seats')
+
+    def __init__(self, rooms):
+        self.rooms = sorted(rooms, key=lambda r: (room_seats(r), getattr(r, 'room_type', ''), r.id))
+        self.seats = [room_seats(r) for r in self.rooms]
+
+    def __bool__(self):
+        return bool(self.rooms)
+
+    def best_fit(self, enrollment=None):
+        """Smallest room with at least `enrollment` seats, or None when no room is big enough."""
+        i = bisect_left(self.seats, enrollment or 0)
+        return self.rooms[i] if i < len(self.rooms) else None
+
 def append_free_classes(schedule_data, valid_dates, available_slots, rooms, subjects):
     """Fill unoccupied room/slot pairs with FREE/EXTRA markers.
     - FREE: slot/room has no scheduled class.
@@ -331,30 +788,38 @@ def append_free_classes(schedule_data, valid_dates, available_slots, rooms, subj
         ts_map[(ts.start_time.strftime('%H:%M'), ts.end_time.strftime('%H:%M'))] = ts
 
     # Add FREE classes for empty slots, but keep them sparse (at most 1 free block per day)
-    for d in list(valid_dates):
+    # (start, end) as used for occupancy keys, plus the HH:MM:SS form written to rows;
+    # formatted once and shared by every FREE row
+    slot_strings = []
+    for ts in available_slots:
+        st = getattr(ts.start_time, 'strftime', lambda fmt: str(ts.start_time))('%H:%M')
+        et = getattr(ts.end_time, 'strftime', lambda fmt: str(ts.end_time))('%H:%M')
+        slot_strings.append((
+            st, et,
+            (st if len(st.split(':'))==3 else f"{st}:00"),
+            (et if len(et.split(':'))==3 else f"{et}:00"),
+        ))
+    room_names = [getattr(r, 'name', str(getattr(r, 'id', 'room'))) for r in rooms]
+    for d in valid_dates:
         dstr = getattr(d, 'isoformat', lambda: str(d))()
-        free_added = False
-        for ts in list(available_slots):
-            st = getattr(ts.start_time, 'strftime', lambda fmt: str(ts.start_time))( '%H:%M')
-            et = getattr(ts.end_time, 'strftime', lambda fmt: str(ts.end_time))( '%H:%M')
-            for r in list(rooms):
-                rname = getattr(r, 'name', str(getattr(r,'id','room')))
-                key = (dstr, st, et, rname)
-                if key in occupied:
-                    continue
-                if free_added:
-                    continue
-                schedule_data.append({
-                    'date': dstr,
-                    'start_time': (st if len(st.split(':'))==3 else f"{st}:00"),
-                    'end_time': (et if len(et.split(':'))==3 else f"{et}:00"),
-                    'room': rname,
-                    'teacher': '—',
-                    'subject': 'FREE',
-                    'component_type': 'F',
-                    'component_index': 0
-                })
-                free_added = True
+        free_cell = next(
+            ((slot, rname) for slot in slot_strings for rname in room_names
+             if (dstr, slot[0], slot[1], rname) not in occupied),
+            None
+        )
+        if free_cell is None:
+            continue
+        (_, _, st_full, et_full), rname = free_cell
+        schedule_data.append({
+            'date': dstr,
+            'start_time': st_full,
+            'end_time': et_full,
+            'room': rname,
+            'teacher': '—',
+            'subject': 'FREE',
+            'component_type': 'F',
+            'component_index': 0
+        })
 
     # Add EXTRA classes if declared hours exceed scheduled placements per subject/type
     # Count scheduled by subject/type
@@ -396,24 +861,24 @@ def append_free_classes(schedule_data, valid_dates, available_slots, rooms, subj
     return schedule_data
 
 
-def build_semester_schedule(class_components, valid_dates, available_slots, rooms, teachers=None, subject_teacher_assignments=None):
+def build_semester_schedule(class_components, valid_dates, available_slots, rooms, teachers=None, subject_teacher_assignments=None, seed: int = 0, progress=None):
     """Deterministic greedy semester scheduler respecting:
     - Subject demand by type (L/T/P)
     - Semester days (excl. Sundays and holidays via valid_dates)
     - Room type eligibility: Lecture Hall & Classroom for L/T, Lab for P/T
+    - Room capacity: the smallest eligible room seating the subject's enrollment (best fit)
     - Non-break time slots only
-    - Even spreading across days with deterministic rotation
-    Returns (schedule_data, legend).
+    - Even spreading across days with deterministic rotation (varied by `seed`)
+    Returns (schedule_data, legend). `progress` (a ProgressReporter) gets a throttled tick per component.
+
+    Memory: besides the sorted component list and the placed rows (both O(components)),
+    the working state is a fixed 17 bytes per teaching day plus one byte per (day, slot)
+    cell, so multi-year horizons only add a few kilobytes.
     """
-    # Index occupancy: (date, slot_id) -> set(room_id)
-    room_occ = {}
-    # Ensure at most one visible class per day/slot (frontend has one cell per day-slot)
-    day_slot_taken = set()
-    # Deterministic order of rooms per type
+    # Capacity-sorted room index per component type for best-fit assignment
     rooms_by_type = {
-        'L': sorted([r for r in rooms if getattr(r, 'room_type', None) in ['Lecture Hall', 'Classroom']], key=lambda r: (getattr(r, 'room_type', ''), r.id)),
-        'T': sorted([r for r in rooms if getattr(r, 'room_type', None) in ['Lecture Hall', 'Classroom', 'Lab']], key=lambda r: (getattr(r, 'room_type', ''), r.id)),
-        'P': sorted([r for r in rooms if getattr(r, 'room_type', None) == 'Lab'], key=lambda r: (getattr(r, 'room_type', ''), r.id)),
+        ctype: RoomIndex([r for r in rooms if getattr(r, 'room_type', None) in allowed])
+        for ctype, allowed in ROOM_TYPES_BY_COMPONENT.items()
     }
 
     # Sort to MIX subjects while preserving priorities:
@@ -425,85 +890,157 @@ def build_semester_schedule(class_components, valid_dates, available_slots, room
         return (
             int(c.get('component_index', 0)),
             order_rank.get(c.get('component_type'), 9),
-            hash_id(str(c.get('subject_id')))
+            hash_id(seeded_key(c.get('subject_id'), seed))
         )
     comps = sorted(class_components, key=mix_key)
 
     schedule_data = []
-    # Cap classes per subject per day (change here to 1 if required)
-    MAX_PER_SUBJECT_PER_DAY = 2
-    # Track how many classes a subject has per day
-    subj_day_count = {}
 
     if not valid_dates or not available_slots or not rooms:
         return schedule_data, {}
 
-    # For even spread: compute rotation offsets per subject (hash_id defined at module scope)
-
-    # Precompute slot index map for packing from the start of the day
-    slot_index = {getattr(ts, 'id', ts): idx for idx, ts in enumerate(available_slots)}
-    # Track next earliest slot pointer per day to reduce free gaps
-    day_next_index = {getattr(d, 'isoformat', lambda: str(d))(): 0 for d in valid_dates}
+    n_days = len(valid_dates)
+    n_slots = len(available_slots)
+    slot_start = [getattr(ts.start_time, 'strftime', lambda fmt: str(ts.start_time))('%H:%M:%S') for ts in available_slots]
+    slot_end = [getattr(ts.end_time, 'strftime', lambda fmt: str(ts.end_time))('%H:%M:%S') for ts in available_slots]
+
+    # Working state is integer-encoded and sized by the horizon, not by what was visited:
+    # - taken: one byte per (day index, slot index) cell, cell = day * n_slots + slot.
+    #   The frontend has one cell per day-slot, so at most one class (hence one room)
+    #   occupies a cell and no per-room occupancy is needed.
+    # - free_left: free cells per day, so full days are skipped without scanning slots
+    # - next_free: next earliest slot pointer per day to pack classes from the start of the day
+    # - subj_day_count: classes per (subject, day index); only days with placements get entries
+    taken = bytearray(n_days * n_slots)
+    free_left = array('l', [n_slots]) * n_days
+    next_free = array('l', [0]) * n_days
+    subj_day_count = {}
+    total = len(comps)
+    unplaced = 0
+    placed_count = 0
+    # teacher id -> TeacherConstraints, only for teachers with availability data
+    constraints = compile_teacher_constraints(teachers, valid_dates, available_slots) if subject_teacher_assignments else {}
+
+    # Multi-slot blocks need slot adjacency: order[pos] is the slot index at time position pos,
+    # and a run of positions is contiguous while each slot ends where the next one starts
+    # (a break slot in between leaves a gap). Free-interval indexes are built lazily per day.
+    has_blocks = any(int(c.get('duration', 1) or 1) > 1 for c in comps)
+    intervals = {}
+    if has_blocks:
+        order = sorted(range(n_slots), key=lambda i: slot_start[i])
+        pos_of = [0] * n_slots
+        for p, si in enumerate(order):
+            pos_of[si] = p
+        seg_end_after = [
+            p == n_slots - 1 or slot_end[order[p]] != slot_start[order[p + 1]]
+            for p in range(n_slots)
+        ]
+
+        def day_intervals(di):
+            fi = intervals.get(di)
+            if fi is None:
+                base = di * n_slots
+                runs, run_start = [], None
+                for p in range(n_slots):
+                    if not taken[base + order[p]]:
+                        if run_start is None:
+                            run_start = p
+                        if seg_end_after[p]:
+                            runs.append((run_start, p + 1))
+                            run_start = None
+                    elif run_start is not None:
+                        runs.append((run_start, p))
+                        run_start = None
+                fi = intervals[di] = FreeIntervals(runs)
+            return fi
 
     for comp in comps:
-        placed = False
+        if progress is not None:
+            progress.placement(placed_count, total, unplaced)
         ctype = comp['component_type']
-        subj = comp.get('subject_name') or str(comp.get('subject_id'))
-        # rotate day start by subject hash
-        rot = hash_id(str(comp['subject_id'])) % len(valid_dates)
-        day_iter = valid_dates[rot:] + valid_dates[:rot]
-        for d in day_iter:
-            d_iso = getattr(d, 'isoformat', lambda: str(d))()
-            # iterate time slots starting from the day's next earliest index to pack schedule
-            start_i = max(0, min(day_next_index.get(d_iso, 0), len(available_slots)-1))
-            slot_iter = list(range(start_i, len(available_slots))) + list(range(0, start_i))
-            for si in slot_iter:
-                ts = available_slots[si]
-                key = (d, getattr(ts, 'id', ts))
-                if key not in room_occ:
-                    room_occ[key] = set()
-                # enforce per-subject per-day cap
-                cap_key = (comp['subject_id'], d_iso)
-                if subj_day_count.get(cap_key, 0) >= MAX_PER_SUBJECT_PER_DAY:
+        eligible = rooms_by_type.get(ctype)
+        if not eligible:
+            # no room of a suitable type anywhere; append_free_classes adds EXTRA markers later
+            unplaced += 1
+            continue
+        # every cell that is not taken has all rooms free, so the best fit is the same on every day
+        r = eligible.best_fit(comp.get('enrollment'))
+        if r is None:
+            # cohort larger than every eligible room
+            unplaced += 1
+            continue
+        sid = comp['subject_id']
+        subj = comp.get('subject_name') or str(sid)
+        tc = constraints.get(subject_teacher_assignments.get(sid)) if constraints else None
+        slot_mask = tc.slot_mask if tc is not None else 0
+        duration = int(comp.get('duration', 1) or 1)
+        if duration > 1:
+            # teacher-blocked slots translated to time positions for FreeIntervals.find
+            pos_mask = sum(1 << pos_of[i] for i in range(n_slots) if (slot_mask >> i) & 1)
+        # rotate day start by subject hash (hash_id defined at module scope) for an even spread
+        rot = hash_id(seeded_key(sid, seed)) % n_days
+        for k in range(n_days):
+            di = rot + k
+            if di >= n_days:
+                di -= n_days
+            if free_left[di] < duration:
+                continue
+            # teacher unavailable or at their daily/weekly limit
+            if tc is not None and (tc.blocked[di] or (duration > 1 and not tc.fits(di, duration))):
+                continue
+            # enforce per-subject per-day cap (a block counts as one class)
+            cap_key = (sid, di)
+            if subj_day_count.get(cap_key, 0) >= MAX_PER_SUBJECT_PER_DAY:
+                continue
+            base = di * n_slots
+            if duration > 1:
+                fi = day_intervals(di)
+                pos = fi.find(duration, pos_mask)
+                if pos is None:
                     continue
-                # enforce global day-slot single visible class
-                if (d_iso, getattr(ts, 'id', ts)) in day_slot_taken:
+                fi.occupy(pos, duration)
+                cells = [order[p] for p in range(pos, pos + duration)]
+            else:
+                # iterate time slots starting from the day's next earliest index to pack schedule
+                start_i = min(next_free[di], n_slots - 1)
+                si = next((i for i in chain(range(start_i, n_slots), range(0, start_i))
+                           if not taken[base + i] and not (slot_mask >> i) & 1), None)
+                if si is None:
                     continue
-                # iterate eligible rooms
-                for r in rooms_by_type.get(ctype, []):
-                    rid = getattr(r, 'id', r)
-                    if rid in room_occ[key]:
-                        continue
-                    # Tutorial can also use Lab
-                    if ctype == 'T' and getattr(r, 'room_type', None) not in ['Classroom', 'Lecture Hall', 'Lab']:
-                        continue
-                    # Place
-                    room_occ[key].add(rid)
-                    day_slot_taken.add((d_iso, getattr(ts, 'id', ts)))
-                    schedule_data.append({
-                        'date': d_iso,
-                        'start_time': getattr(ts.start_time, 'strftime', lambda fmt: str(ts.start_time))('%H:%M:%S'),
-                        'end_time': getattr(ts.end_time, 'strftime', lambda fmt: str(ts.end_time))('%H:%M:%S'),
-                        'room': getattr(r, 'name', str(rid)),
-                        'subject': subj,
-                        'component_type': ctype,
-                        'component_index': comp['component_index']
-                    })
-                    subj_day_count[cap_key] = subj_day_count.get(cap_key, 0) + 1
-                    # advance day pointer to next unused slot index
-                    next_i = si + 1
-                    while next_i < len(available_slots) and (d_iso, getattr(available_slots[next_i], 'id', available_slots[next_i])) in day_slot_taken:
-                        next_i += 1
-                    day_next_index[d_iso] = min(next_i, len(available_slots)-1)
-                    placed = True
-                    break
-                if placed:
-                    break
-            if placed:
-                break
-        if not placed:
-            # could not place; continue to next (append_free_classes will add EXTRA markers later)
-            pass
+                if di in intervals:
+                    intervals[di].occupy(pos_of[si])
+                cells = [si]
+            # Place (one row per occupied slot, all in the same room)
+            d = valid_dates[di]
+            d_iso = getattr(d, 'isoformat', lambda: str(d))()
+            for si in cells:
+                taken[base + si] = 1
+                schedule_data.append({
+                    'date': d_iso,
+                    'start_time': slot_start[si],
+                    'end_time': slot_end[si],
+                    'room': getattr(r, 'name', str(getattr(r, 'id', r))),
+                    'subject': subj,
+                    'component_type': ctype,
+                    'component_index': comp['component_index']
+                })
+            free_left[di] -= len(cells)
+            if tc is not None:
+                tc.book(di, duration)
+            placed_count += 1
+            subj_day_count[cap_key] = subj_day_count.get(cap_key, 0) + 1
+            # advance day pointer to next unused slot index
+            si = cells[-1]
+            next_i = si + 1
+            while next_i < n_slots and taken[base + next_i]:
+                next_i += 1
+            next_free[di] = min(next_i, n_slots - 1)
+            break
+        else:
+            unplaced += 1
+
+    if progress is not None:
+        progress.placement(placed_count, total, unplaced, force=True)
 
     # Build legend from subject_teacher_assignments if provided
     legend = {}
@@ -519,12 +1056,14 @@ def build_semester_schedule(class_components, valid_dates, available_slots, room
     # Inject teacher names into schedule rows if available
     if teachers and subject_teacher_assignments:
         tid_to_name = {t.id: t.name for t in teachers}
+        # subject name -> id of the first component carrying that name
+        name_to_sid = {}
+        for c in class_components:
+            name_to_sid.setdefault(c.get('subject_name'), c['subject_id'])
         for row in schedule_data:
-            # Find subject id by matching subject name from class_components
             sname = row.get('subject')
-            comp = next((c for c in class_components if c.get('subject_name') == sname), None)
-            if comp:
-                tid = subject_teacher_assignments.get(comp['subject_id'])
+            if sname in name_to_sid:
+                tid = subject_teacher_assignments.get(name_to_sid[sname])
                 if tid in tid_to_name:
                     row['teacher'] = tid_to_name[tid]
 
@@ -0,0 +1,121 @@
+from datetime import date, time
+
+from .solver import MAX_PER_SUBJECT_PER_DAY, ROOM_TYPES_BY_COMPONENT, room_seats
+
+
+def _is_class(row) -> bool:
+    """FREE fillers and EXTRA advisory rows are markers, not classes."""
+    return row.get('component_type') in ROOM_TYPES_BY_COMPONENT and not str(row.get('subject', '')).startswith('EXTRA ')
+
+
+def validate_schedule(rows, dataset):
+    """Check an edited timetable in one pass over its rows.
+
+    rows are ScheduleItem dicts; dataset is solver.load_dataset output. Every
+    check is a lookup in a hash index built from the dataset up front or filled
+    while walking the rows, so the cost is linear in the number of rows.
+    Returns a list of violation dicts (row, kind, message, related_row).
+    """
+    room_types = {r.name: r.room_type for r in dataset.rooms}
+    room_capacity = {r.name: room_seats(r) for r in dataset.rooms}
+    enrollment = {s.name: s.enrollment for s in dataset.subjects if getattr(s, 'enrollment', None)}
+    breaks = [(ts.start_time, ts.end_time) for ts in dataset.timeslots if ts.is_break]
+    slot_ids = {(ts.start_time, ts.end_time): ts.id for ts in dataset.timeslots}
+    holidays = set(dataset.holidays)
+    unavailable = {
+        t.name: (set(t.unavailable_dates or ()), set(t.unavailable_timeslots or ()))
+        for t in dataset.teachers
+    }
+
+    room_at = {}      # (date, start, room) -> first row index
+    teacher_at = {}   # (date, start, teacher) -> first row index
+    subject_day = {}  # (date, subject) -> set of (type, index) classes
+    cap_reported = set()
+    parsed_dates = {}
+    parsed_times = {}
+    break_hits = {}
+
+    def parse_date(value):
+        if value not in parsed_dates:
+            try:
+                parsed_dates[value] = date.fromisoformat(value)
+            except ValueError:
+                parsed_dates[value] = None
+        return parsed_dates[value]
+
+    def parse_time(value):
+        if value not in parsed_times:
+            try:
+                parsed_times[value] = time.fromisoformat(value)
+            except ValueError:
+                parsed_times[value] = None
+        return parsed_times[value]
+
+    def overlaps_break(start, end):
+        key = (start, end)
+        if key not in break_hits:
+            break_hits[key] = any(start < b_end and b_start < end for b_start, b_end in breaks)
+        return break_hits[key]
+
+    violations = []
+
+    def report(i, kind, message, related=None):
+        violations.append({'row': i, 'kind': kind, 'message': message, 'related_row': related})
+
+    for i, row in enumerate(rows):
+        if not _is_class(row):
+            continue
+        d = parse_date(row.get('date'))
+        start = parse_time(row.get('start_time'))
+        end = parse_time(row.get('end_time'))
+        if d is None or start is None or end is None:
+            report(i, 'invalid', "Unparseable date or time")
+            continue
+        room = row.get('room')
+        teacher = row.get('teacher')
+        subject = row.get('subject')
+        ctype = row.get('component_type')
+
+        # Calendar
+        if d.weekday() == 6:
+            report(i, 'holiday', f"{d.isoformat()} is a Sunday")
+        elif d in holidays:
+            report(i, 'holiday', f"{d.isoformat()} is a holiday")
+        if overlaps_break(start, end):
+            report(i, 'break', f"{row.get('start_time')}-{row.get('end_time')} overlaps a break")
+
+        # Room existence and type
+        rtype = room_types.get(room)
+        if rtype is None:
+            report(i, 'unknown_room', f"Room '{room}' does not exist")
+        elif rtype not in ROOM_TYPES_BY_COMPONENT[ctype]:
+            report(i, 'room_type', f"{ctype} class of {subject} in {rtype} '{room}'; allowed: {', '.join(ROOM_TYPES_BY_COMPONENT[ctype])}")
+        if rtype is not None and enrollment.get(subject, 0) > room_capacity[room]:
+            report(i, 'room_capacity', f"{subject} has {enrollment[subject]} students but '{room}' seats {room_capacity[room]}")
+
+        # Clashes
+        key = (d, start, room)
+        first = room_at.setdefault(key, i)
+        if first != i:
+            report(i, 'room_clash', f"Room '{room}' is double-booked at {d.isoformat()} {row.get('start_time')}", first)
+        if teacher and teacher != '—':
+            key = (d, start, teacher)
+            first = teacher_at.setdefault(key, i)
+            if first != i:
+                report(i, 'teacher_clash', f"Teacher '{teacher}' is double-booked at {d.isoformat()} {row.get('start_time')}", first)
+
+            blocked = unavailable.get(teacher)
+            if blocked is not None:
+                if d in blocked[0]:
+                    report(i, 'teacher_unavailable', f"Teacher '{teacher}' is unavailable on {d.isoformat()}")
+                elif slot_ids.get((start, end)) in blocked[1]:
+                    report(i, 'teacher_unavailable', f"Teacher '{teacher}' is unavailable at {row.get('start_time')}")
+
+        # Per-subject daily cap; the slots of one block share (type, index) and count once
+        classes = subject_day.setdefault((d, subject), set())
+        classes.add((ctype, row.get('component_index')))
+        if len(classes) > MAX_PER_SUBJECT_PER_DAY and (d, subject) not in cap_reported:
+            cap_reported.add((d, subject))
+            report(i, 'subject_daily_cap', f"{subject} has more than {MAX_PER_SUBJECT_PER_DAY} classes on {d.isoformat()}")
+
+    return violations
@@ -0,0 +1,69 @@
+"""Helpers shared by the benchmark scripts: run the API in a child uvicorn process."""
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from contextlib import contextmanager
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def backend_env(extra=None):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = BACKEND_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    env.update(extra or {})
+    return env
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(workdir, port, workers=1, env=None):
+    """Start uvicorn serving app.main in `workdir` (where samaygen.db lives)."""
+    cmd = [sys.executable, '-m', 'uvicorn', 'app.main:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning']
+    if workers > 1:
+        cmd += ['--workers', str(workers)]
+    return subprocess.Popen(cmd, cwd=workdir, env=backend_env(env), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def wait_ready(proc, url, timeout=30.0, started=None):
+    """Poll `url` until it answers 200; returns seconds since `started`."""
+    started = started or time.perf_counter()
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError(f'uvicorn exited early: {proc.stderr.read().decode()}')
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                if resp.status == 200:
+                    return time.perf_counter() - started
+        except OSError:
+            pass
+        if time.perf_counter() - started > timeout:
+            raise RuntimeError('server did not answer within timeout')
+        time.sleep(0.01)
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+@contextmanager
+def running_server(workdir, workers=1, env=None, timeout=30.0):
+    """Context manager yielding the base URL of a ready server."""
+    port = free_port()
+    proc = spawn_server(workdir, port, workers=workers, env=env)
+    base = f'http://127.0.0.1:{port}'
+    try:
+        wait_ready(proc, base + '/teachers/', timeout=timeout)
+        yield base
+    finally:
+        stop_server(proc)
@@ -0,0 +1,270 @@
+"""Local HTTP load test for the API.
+
+Starts uvicorn against a freshly seeded SQLite database in a throwaway
+directory, drives a weighted mix of CRUD list/read/write calls and
+``/generate/`` requests, and reports throughput and p50/p95/p99 latency per
+route. Everything runs on 127.0.0.1 with the standard library only.
+
+Arrivals are open-loop when ``--rate`` is given (Poisson arrivals at that many
+requests per second, served by ``--concurrency`` client threads); latency is
+measured from the scheduled arrival time, so queueing behind a slow server is
+counted instead of hidden. Without ``--rate`` each client thread sends its
+next request as soon as the previous one finishes.
+
+Usage (from the backend directory):
+    python benchmarks/load_test.py --duration 30 --concurrency 8 --rate 40 --output after.json
+    python benchmarks/load_test.py --compare before.json after.json
+"""
+import argparse
+import http.client
+import json
+import math
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+from harness import running_server
+
+# (route label, kind, weight); kind groups routes in the report config only
+DEFAULT_MIX = [
+    ('GET /teachers/', 'list', 15),
+    ('GET /subjects/', 'list', 15),
+    ('GET /rooms/', 'list', 10),
+    ('GET /timeslots/', 'list', 10),
+    ('GET /holidays/', 'list', 5),
+    ('GET /teachers/{id}', 'read', 10),
+    ('GET /subjects/{id}', 'read', 10),
+    ('PUT /teachers/{id}', 'write', 5),
+    ('POST /holidays/', 'write', 5),
+    ('POST /generate/', 'generate', 15),
+]
+
+
+def seed(base, subjects=12, teachers=8, rooms=6, slots=8, rnd=None):
+    """Populate an empty database through the API; returns created ids per resource."""
+    rnd = rnd or random.Random(0)
+    conn = _connect(base)
+    ids = {'teachers': [], 'subjects': [], 'rooms': [], 'timeslots': []}
+    for i in range(teachers):
+        ids['teachers'].append(_call(conn, 'POST', '/teachers/', {'name': f'Teacher {i + 1}'})[1]['id'])
+    for i in range(rooms):
+        room_type = 'Lab' if i % 3 == 2 else ('Lecture Hall' if i % 3 == 1 else 'Classroom')
+        ids['rooms'].append(_call(conn, 'POST', '/rooms/', {'name': f'Room {i + 1}', 'room_type': room_type})[1]['id'])
+    for i in range(subjects):
+        body = {
+            'name': f'Subject {i + 1}',
+            'lecture_hours': rnd.randint(2, 4),
+            'tutorial_hours': rnd.randint(0, 2),
+            'practical_hours': rnd.choice([0, 2]),
+            'semester': 1 + i % 8,
+        }
+        ids['subjects'].append(_call(conn, 'POST', '/subjects/', body)[1]['id'])
+    for i in range(slots):
+        body = {'start_time': f'{9 + i:02d}:00', 'end_time': f'{10 + i:02d}:00', 'is_break': i == 3}
+        ids['timeslots'].append(_call(conn, 'POST', '/timeslots/', body)[1]['id'])
+    conn.close()
+    return ids
+
+
+def _connect(base):
+    parts = urlsplit(base)
+    return http.client.HTTPConnection(parts.hostname, parts.port, timeout=120)
+
+
+def _call(conn, method, path, body=None):
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {'Content-Type': 'application/json'} if payload else {}
+    conn.request(method, path, body=payload, headers=headers)
+    resp = conn.getresponse()
+    data = resp.read()
+    return resp.status, (json.loads(data) if data else None)
+
+
+def build_request(route, ids, rnd, generate_weeks):
+    """Turn a route label into (method, path, body)."""
+    method, template = route.split(' ', 1)
+    if route == 'POST /generate/':
+        # a few distinct Monday starts, so identical in-flight requests also occur
+        start = date(2025, 1, 6) + timedelta(weeks=rnd.randint(0, 3))
+        end = start + timedelta(weeks=generate_weeks, days=-1)
+        return method, template, {'start_date': start.isoformat(), 'end_date': end.isoformat()}
+    if route == 'POST /holidays/':
+        return method, template, {'date': f'2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}', 'description': 'load test'}
+    if route == 'PUT /teachers/{id}':
+        tid = rnd.choice(ids['teachers'])
+        return method, f'/teachers/{tid}', {'name': f'Teacher {tid}'}
+    if '{id}' in template:
+        resource = template.strip('/').split('/')[0]
+        return method, template.replace('{id}', str(rnd.choice(ids[resource]))), None
+    return method, template, None
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(samples, elapsed):
+    routes = {}
+    for route, latency, status in samples:
+        routes.setdefault(route, {'latencies': [], 'statuses': {}})
+        entry = routes[route]
+        entry['latencies'].append(latency)
+        entry['statuses'][str(status)] = entry['statuses'].get(str(status), 0) + 1
+
+    report = {}
+    for route, entry in sorted(routes.items()):
+        lat = sorted(entry['latencies'])
+        errors = sum(n for code, n in entry['statuses'].items() if not code.startswith('2'))
+        report[route] = {
+            'count': len(lat),
+            'throughput_rps': round(len(lat) / elapsed, 2) if elapsed else None,
+            'p50_ms': round(percentile(lat, 50) * 1000, 2),
+            'p95_ms': round(percentile(lat, 95) * 1000, 2),
+            'p99_ms': round(percentile(lat, 99) * 1000, 2),
+            'max_ms': round(lat[-1] * 1000, 2),
+            'errors': errors,
+            'statuses': entry['statuses'],
+        }
+    all_lat = sorted(s[1] for s in samples)
+    report['*'] = {
+        'count': len(all_lat),
+        'throughput_rps': round(len(all_lat) / elapsed, 2) if elapsed else None,
+        'p50_ms': round((percentile(all_lat, 50) or 0) * 1000, 2),
+        'p95_ms': round((percentile(all_lat, 95) or 0) * 1000, 2),
+        'p99_ms': round((percentile(all_lat, 99) or 0) * 1000, 2),
+        'errors': sum(v['errors'] for v in report.values()),
+    }
+    return report
+
+
+def run_load(base, ids, mix, duration, concurrency, rate=None, generate_weeks=8, seed_value=0):
+    routes = [m[0] for m in mix]
+    weights = [m[2] for m in mix]
+    samples = []
+    samples_lock = threading.Lock()
+    arrivals = queue.Queue()
+    stop_at = time.perf_counter() + duration
+
+    def client(index):
+        rnd = random.Random(seed_value * 1000 + index)
+        conn = _connect(base)
+        local = []
+        while True:
+            if rate:
+                scheduled = arrivals.get()
+                if scheduled is None:
+                    break
+            else:
+                scheduled = time.perf_counter()
+                if scheduled >= stop_at:
+                    break
+            route = rnd.choices(routes, weights)[0]
+            method, path, body = build_request(route, ids, rnd, generate_weeks)
+            try:
+                status, _ = _call(conn, method, path, body)
+            except (OSError, http.client.HTTPException):
+                status = 599
+                conn.close()
+                conn = _connect(base)
+            local.append((route, time.perf_counter() - scheduled, status))
+        conn.close()
+        with samples_lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    if rate:
+        rnd = random.Random(seed_value)
+        next_at = started
+        while next_at < stop_at:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            arrivals.put(next_at)
+            next_at += rnd.expovariate(rate)
+        for _ in threads:
+            arrivals.put(None)
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed), elapsed
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)['routes']
+    with open(after_path) as f:
+        after = json.load(f)['routes']
+    print(f"{'route':<24} {'metric':<15} {'before':>10} {'after':>10} {'change':>8}")
+    for route in sorted(set(before) | set(after)):
+        for metric in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'errors'):
+            b = before.get(route, {}).get(metric)
+            a = after.get(route, {}).get(metric)
+            change = f"{(a - b) / b * 100:+.1f}%" if isinstance(a, (int, float)) and isinstance(b, (int, float)) and b else ''
+            print(f"{route:<24} {metric:<15} {str(b):>10} {str(a):>10} {change:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds of load')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--rate', type=float, default=None, help='open-loop arrivals per second (default: closed loop)')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+    parser.add_argument('--generate-weeks', type=int, default=8, help='horizon of /generate/ requests')
+    parser.add_argument('--mix', help='JSON file with [route, kind, weight] entries overriding the default mix')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two saved reports and exit')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    mix = DEFAULT_MIX
+    if args.mix:
+        with open(args.mix) as f:
+            mix = [tuple(m) for m in json.load(f)]
+
+    with tempfile.TemporaryDirectory(prefix='samaygen-load-') as workdir:
+        with running_server(workdir, workers=args.workers) as base:
+            ids = seed(base, rnd=random.Random(args.seed))
+            routes, elapsed = run_load(
+                base, ids, mix, args.duration, args.concurrency,
+                rate=args.rate, generate_weeks=args.generate_weeks, seed_value=args.seed,
+            )
+
+    report = {
+        'config': {
+            'duration': args.duration,
+            'concurrency': args.concurrency,
+            'rate': args.rate,
+            'workers': args.workers,
+            'generate_weeks': args.generate_weeks,
+            'seed': args.seed,
+            'mix': mix,
+        },
+        'elapsed_seconds': round(elapsed, 3),
+        'routes': routes,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
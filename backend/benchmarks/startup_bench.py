@@ -0,0 +1,92 @@
+"""Cold-start benchmark for the API process.
+
+Measures, in fresh interpreter processes:
+- import time of ``app.main``
+- time from spawning uvicorn to the first successful ``GET /teachers/``
+
+and compares the medians against ``startup_budget.json``. Each run uses a
+throwaway working directory so the SQLite file is created from scratch
+(``--warm-db`` reuses one database across runs to measure the warm path).
+
+Usage (from the backend directory):
+    python benchmarks/startup_bench.py [--runs 5] [--output startup.json]
+
+Exits with status 1 when a median exceeds its budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from harness import backend_env, free_port, spawn_server, stop_server, wait_ready
+
+DEFAULT_BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_budget.json')
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def measure_import(workdir):
+    out = subprocess.check_output([sys.executable, '-c', IMPORT_SNIPPET], cwd=workdir, env=backend_env())
+    return float(out.decode().strip().splitlines()[-1])
+
+
+def measure_first_request(workdir, timeout=30.0):
+    port = free_port()
+    started = time.perf_counter()
+    proc = spawn_server(workdir, port)
+    try:
+        return wait_ready(proc, f'http://127.0.0.1:{port}/teachers/', timeout=timeout, started=started)
+    finally:
+        stop_server(proc)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', default=DEFAULT_BUDGET)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--warm-db', action='store_true', help='reuse one database across runs')
+    args = parser.parse_args(argv)
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+
+    imports, firsts = [], []
+    with tempfile.TemporaryDirectory(prefix='samaygen-startup-') as root:
+        for i in range(args.runs):
+            # cold runs each get an empty directory, so every run creates its own database
+            workdir = root if args.warm_db else os.path.join(root, f'run-{i}')
+            os.makedirs(workdir, exist_ok=True)
+            imports.append(measure_import(workdir))
+            firsts.append(measure_first_request(workdir))
+
+    report = {
+        'runs': args.runs,
+        'warm_db': args.warm_db,
+        'import_seconds': {'median': statistics.median(imports), 'min': min(imports), 'max': max(imports)},
+        'first_request_seconds': {'median': statistics.median(firsts), 'min': min(firsts), 'max': max(firsts)},
+        'budget': budget,
+    }
+    over = [k for k in ('import_seconds', 'first_request_seconds') if k in budget and report[k]['median'] > budget[k]]
+    report['within_budget'] = not over
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    if over:
+        print(f"Over budget: {', '.join(over)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Admission control: coalescing, 429 + Retry-After, and shared leader errors."""
+import os
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+os.environ.setdefault('SAMAYGEN_RESULT_STORE', 'off')
+
+from app import admission, main
+
+
+def _start(controller, key, fn, outcomes):
+    """Run controller.run(key, fn) on a thread, recording its result or exception."""
+    def target():
+        try:
+            outcomes.append(controller.run(key, fn))
+        except BaseException as e:
+            outcomes.append(e)
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.005)
+
+
+def test_identical_calls_share_one_computation():
+    controller = admission.AdmissionController(max_concurrent=1, max_queue=0, max_followers=3)
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'schedule'
+
+    outcomes = []
+    leader = _start(controller, 'k', compute, outcomes)
+    _wait_for(lambda: controller.stats()['running'] == 1)
+    followers = [_start(controller, 'k', compute, outcomes) for _ in range(3)]
+    _wait_for(lambda: controller.stats()['following'] == 3)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == [1]
+    assert outcomes == ['schedule'] * 4
+    assert controller.stats()['following'] == 0
+
+
+def test_overload_answers_429_with_retry_after(monkeypatch):
+    controller = admission.AdmissionController(max_concurrent=1, max_queue=0, retry_after=7, max_followers=1)
+    monkeypatch.setattr(main, 'generation', controller)
+    release = threading.Event()
+    outcomes = []
+    threads = [_start(controller, 'busy', lambda: release.wait(5), outcomes)]
+    _wait_for(lambda: controller.stats()['running'] == 1)
+    try:
+        # No free slot and no queue place for a different key
+        with pytest.raises(HTTPException) as exc:
+            main.run_admitted('other', lambda: 'never')
+        assert exc.value.status_code == 429
+        assert exc.value.headers == {'Retry-After': '7'}
+
+        # Followers of the running key are capped as well
+        threads.append(_start(controller, 'busy', lambda: 'never', outcomes))
+        _wait_for(lambda: controller.stats()['following'] == 1)
+        with pytest.raises(HTTPException) as exc:
+            main.run_admitted('busy', lambda: 'never')
+        assert exc.value.status_code == 429
+        assert exc.value.headers == {'Retry-After': '7'}
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join(5)
+    assert outcomes == [True, True]
+
+
+def test_leader_exception_reaches_followers():
+    controller = admission.AdmissionController(max_concurrent=1, max_queue=0, max_followers=2)
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise ValueError('solver failed')
+
+    outcomes = []
+    leader = _start(controller, 'k', compute, outcomes)
+    _wait_for(lambda: controller.stats()['running'] == 1)
+    followers = [_start(controller, 'k', compute, outcomes) for _ in range(2)]
+    _wait_for(lambda: controller.stats()['following'] == 2)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(outcomes) == 3
+    assert all(isinstance(e, ValueError) and str(e) == 'solver failed' for e in outcomes)
+    assert controller.stats()['inflight_keys'] == 0
@@ -0,0 +1,103 @@
+"""Peak-memory checks for schedule generation across growing horizons.
+
+Runs the greedy scheduler on a synthetic dataset for horizons from one
+semester to several years and records tracemalloc peaks for:
+- ``build``: build_semester_schedule alone (placement working state + placed rows)
+- ``pipeline``: schedule_from_dataset end to end (calendar, placement, FREE/EXTRA rows)
+
+The placement working state is bounded by O(C) for the C placed components
+plus a few bytes per (teaching day, slot), so ``build`` must stay flat as
+the horizon grows; the pipeline additionally carries one FREE row per day
+and is checked against a per-day byte budget.
+"""
+import gc
+import tracemalloc
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app import solver
+
+HORIZON_WEEKS = (20, 52, 104, 208)
+# build peak at the longest horizon may be at most this multiple of the shortest
+MAX_BUILD_GROWTH = 1.25
+# pipeline bytes per additional teaching day: the response carries one FREE row per day
+MAX_PIPELINE_BYTES_PER_DAY = 2048
+
+
+def synthetic_dataset(subjects=12, rooms=6, slots=8):
+    return SimpleNamespace(
+        teachers=[SimpleNamespace(id=i, name=f'Teacher {i}') for i in range(1, subjects // 2 + 1)],
+        rooms=[
+            SimpleNamespace(id=i, name=f'Room {i}', room_type=('Lab' if i % 4 == 0 else 'Classroom'))
+            for i in range(1, rooms + 1)
+        ],
+        subjects=[
+            SimpleNamespace(id=i, name=f'Subject {i}', lecture_hours=30, tutorial_hours=6,
+                            practical_hours=12 if i % 2 else 0, semester=None, branch=None)
+            for i in range(1, subjects + 1)
+        ],
+        timeslots=[
+            SimpleNamespace(id=i, start_time=time(9 + i), end_time=time(10 + i), is_break=(i == 3))
+            for i in range(slots)
+        ],
+        holidays=set(),
+    )
+
+
+def _peak(fn):
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, result
+
+
+def measure(weeks, dataset, start=date(2025, 1, 6)):
+    end = start + timedelta(weeks=weeks) - timedelta(days=1)
+    valid_dates = solver.teaching_dates(start, end, dataset.holidays)
+    components = solver.expand_components(dataset.subjects)
+    slots = [ts for ts in dataset.timeslots if not ts.is_break]
+    assignments = solver.assign_teachers(dataset.subjects, dataset.teachers)
+
+    build_peak, (rows, _) = _peak(lambda: solver.build_semester_schedule(
+        components, valid_dates, slots, dataset.rooms, dataset.teachers, assignments
+    ))
+    pipeline_peak, response = _peak(lambda: solver.schedule_from_dataset(dataset, start, end))
+    return {
+        'weeks': weeks,
+        'teaching_days': len(valid_dates),
+        'components': len(components),
+        'placed': len(rows),
+        'build_peak_bytes': build_peak,
+        'pipeline_peak_bytes': pipeline_peak,
+        'success': response.success,
+    }
+
+
+@pytest.fixture(scope='module')
+def runs():
+    dataset = synthetic_dataset()
+    return [measure(w, dataset) for w in HORIZON_WEEKS]
+
+
+def test_every_horizon_places_all_components(runs):
+    for run in runs:
+        assert run['success'], run
+        assert run['placed'] == run['components'], run
+
+
+def test_build_peak_stays_flat(runs):
+    growth = runs[-1]['build_peak_bytes'] / max(1, runs[0]['build_peak_bytes'])
+    assert growth <= MAX_BUILD_GROWTH, runs
+
+
+def test_pipeline_peak_per_teaching_day(runs):
+    first, last = runs[0], runs[-1]
+    per_day = (last['pipeline_peak_bytes'] - first['pipeline_peak_bytes']) / max(1, last['teaching_days'] - first['teaching_days'])
+    assert per_day <= MAX_PIPELINE_BYTES_PER_DAY, runs
@@ -0,0 +1,82 @@
+"""Shared result store: TTL expiry, LRU eviction and unreadable entries."""
+import os
+import random
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault('SAMAYGEN_RESULT_STORE', 'off')
+
+from app import main, result_store, schemas
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_store, 'time', SimpleNamespace(time=clock.time))
+    return clock
+
+
+def payload(seed, size=4096):
+    """Incompressible JSON string, so every entry stores about `size` bytes."""
+    rng = random.Random(seed)
+    return '"' + ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(size)) + '"'
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    store = result_store.ResultStore(str(tmp_path / 'results.db'), ttl=60)
+    store.put('a', payload(1))
+    clock.now += 59
+    assert store.get('a') == payload(1)
+    clock.now += 1
+    assert store.get('a') is None
+    assert store.stats()['entries'] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    store = result_store.ResultStore(str(tmp_path / 'results.db'), ttl=3600)
+    store.put('probe', payload(0))
+    size = store.stats()['bytes']
+    store.evict(clock.now + 3600)
+    # Room for two entries, not three
+    store.max_bytes = int(size * 2.5)
+
+    for key, seed in (('a', 1), ('b', 2)):
+        clock.now += 1
+        store.put(key, payload(seed))
+    clock.now += 1
+    assert store.get('a') == payload(1)  # 'b' is now the least recently used
+    clock.now += 1
+    store.put('c', payload(3))
+
+    assert store.get('b') is None
+    assert store.get('a') == payload(1)
+    assert store.get('c') == payload(3)
+    assert store.stats()['bytes'] <= store.max_bytes
+
+
+def test_unreadable_entries_are_a_cache_miss(tmp_path, monkeypatch):
+    store = result_store.ResultStore(str(tmp_path / 'results.db'))
+    monkeypatch.setattr(main, 'results', store)
+
+    # Written by a build with another response schema
+    store.put('old', '{"success": "maybe"}')
+    assert main.cached_result('old', schemas.ScheduleResponse) is None
+
+    # Not zlib data
+    store.put('corrupt', '{}')
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("UPDATE results SET value = ? WHERE key = 'corrupt'", (b'not zlib',))
+    assert main.cached_result('corrupt', schemas.ScheduleResponse) is None
+
+    store.put('ok', schemas.ScheduleResponse(success=True).model_dump_json())
+    assert main.cached_result('ok', schemas.ScheduleResponse) == schemas.ScheduleResponse(success=True)
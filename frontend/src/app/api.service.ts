@@ -5,12 +5,17 @@ import { Observable } from 'rxjs';
 export interface Teacher {
   id: number;
   name: string;
+  unavailable_dates?: string[];
+  unavailable_timeslots?: number[];
+  max_hours_per_day?: number | null;
+  max_hours_per_week?: number | null;
 }
 
 export interface Room {
   id: number;
   name: string;
   room_type: string;
+  capacity?: number | null;
 }
 
 export interface Subject {
@@ -21,6 +26,9 @@ export interface Subject {
   practical_hours: number;
   semester?: number | null;
   branch?: string | null;
+  enrollment?: number | null;
+  lecture_block_size?: number;
+  practical_block_size?: number;
 }
 
 export interface TimeSlot {